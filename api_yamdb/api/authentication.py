@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CACHE_KEY = 'yamdb:user:{}'
+# Поля, которых достаточно аутентификации и проверкам прав.
+USER_SNAPSHOT_FIELDS = ('id', 'username', 'role', 'is_superuser', 'is_active')
+
+
+def forget_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация, берущая пользователя из кэша, а не из БД.
+
+    request.user собирается из снимка USER_SNAPSHOT_FIELDS как модель
+    с отложенными полями: остальные поля подгружаются при обращении,
+    а save() сохраняет только загруженные и изменённые поля.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+
+        key = USER_CACHE_KEY.format(user_id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values(*USER_SNAPSHOT_FIELDS).first()
+            if snapshot is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found'
+                )
+            cache.set(key, snapshot, settings.USER_CACHE_TIMEOUT)
+
+        # from_db ждёт значения в порядке полей модели.
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in snapshot
+        ]
+        user = self.user_model.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [snapshot[name] for name in field_names]
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
@@ -0,0 +1,327 @@
+"""Нагрузочный прогон API в процессе через тестовый клиент Django.
+
+Сценарии ходят в настоящий URLconf и работают с копией текущей базы
+данных (например, заполненной generate_dataset) во временном файле.
+Каждый запрос записи фиксирует свою транзакцию, как в работе, поэтому
+в замер входят COMMIT и срабатывают отложенные сдвиги поколений, а
+исходная база не меняется. После прогона кэш очищается: в нём остались
+бы ответы и поколения, построенные по данным копии.
+"""
+import itertools
+import math
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, Max, Prefetch
+from django.db.utils import load_backend
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.middleware import QueryStats
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from .fast_serializers import (
+    CommentFastSerializer,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
+from .serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleReadSerializer,
+)
+from .slugs import SLUG_MAPS
+
+BENCH_USERNAME = 'bench_user'
+BENCH_CODE = 'BENCHMRK'
+
+
+class Scenario:
+
+    def __init__(self, name, method, url, data=None, client='anonymous',
+                 expected_status=200):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.data = data
+        self.client = client
+        self.expected_status = expected_status
+
+    def request(self, clients, iteration):
+        url = self.url(iteration) if callable(self.url) else self.url
+        data = self.data(iteration) if callable(self.data) else self.data
+        client = clients[self.client]
+        return getattr(client, self.method)(url, data=data)
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+def build_scenarios(requests_per_scenario):
+    """Выбирает объекты из текущих данных и описывает сценарии."""
+    title = Title.objects.order_by('-score_count', 'id').first()
+    if title is None:
+        raise ValueError('В базе нет произведений: запустите generate_dataset')
+    review = Review.objects.filter(title=title).annotate(
+        last_comment=Max('comments__pub_date')
+    ).order_by('-last_comment', 'id').first()
+    genre_slugs = list(Genre.objects.filter(titles=title).order_by(
+        'id'
+    ).values_list('slug', flat=True)[:2]) or ['']
+    category = Category.objects.filter(pk=title.category_id).first()
+    # Пользователь бенчмарка может оставить один отзыв на произведение.
+    free_titles = list(Title.objects.order_by('id').values_list(
+        'id', flat=True
+    )[:requests_per_scenario])
+
+    reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+    scenarios = [
+        Scenario('titles_list', 'get', '/api/v1/titles/'),
+        Scenario(
+            'titles_filter', 'get',
+            f'/api/v1/titles/?genre={genre_slugs[0]}'
+            f'&category={category.slug if category else ""}'
+        ),
+        Scenario(
+            'titles_filter_all_genres', 'get',
+            f'/api/v1/titles/?genre={",".join(genre_slugs)}&genre_match=all'
+        ),
+        Scenario(
+            'titles_filter_icontains', 'get',
+            f'/api/v1/titles/?genre__icontains={genre_slugs[0]}'
+            f'&category__icontains={category.slug if category else ""}'
+        ),
+        Scenario('title_detail', 'get', f'/api/v1/titles/{title.id}/'),
+        Scenario('reviews_list', 'get', reviews_url),
+        Scenario(
+            'signup', 'post', '/api/v1/auth/signup/',
+            lambda i: {
+                'username': f'bench_signup_{i}',
+                'email': f'bench_signup_{i}@yamdb.fake',
+            }
+        ),
+        Scenario(
+            'token', 'post', '/api/v1/auth/token/',
+            {'username': BENCH_USERNAME, 'confirmation_code': BENCH_CODE}
+        ),
+    ]
+    # Без свободного произведения на каждый запрос сценарий мерил бы 404.
+    if len(free_titles) == requests_per_scenario:
+        titles = iter(free_titles)
+        scenarios.insert(6, Scenario(
+            'review_create', 'post',
+            lambda _: f'/api/v1/titles/{next(titles)}/reviews/',
+            {'text': 'benchmark', 'score': 7},
+            client='user', expected_status=201
+        ))
+    if review is not None:
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        scenarios[6:6] = [
+            Scenario('comments_list', 'get', comments_url),
+            Scenario(
+                'comment_create', 'post', comments_url,
+                {'text': 'benchmark'}, client='user', expected_status=201
+            ),
+        ]
+    return scenarios
+
+
+def measure(scenario, clients, iterations, warmup, cold):
+    timings = []
+    queries = 0
+    errors = 0
+    counter = itertools.count()
+    for _ in range(warmup):
+        scenario.request(clients, next(counter))
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+        stats = QueryStats()
+        iteration = next(counter)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            started = time.perf_counter()
+            response = scenario.request(clients, iteration)
+            timings.append(time.perf_counter() - started)
+        queries += stats.count
+        if response.status_code != scenario.expected_status:
+            errors += 1
+    total = sum(timings)
+    return {
+        'iterations': iterations,
+        'errors': errors,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'mean_ms': total / iterations * 1000,
+        'throughput_rps': iterations / total if total else 0.0,
+        'queries_per_request': queries / iterations,
+    }
+
+
+def serialization_cases():
+    """Страницы списков, как их выбирают вьюсеты, для самых больших выборок."""
+    title = Title.objects.order_by('-score_count', 'id').first()
+    review = Review.objects.filter(title=title).annotate(
+        comment_count=Count('comments')
+    ).order_by('-comment_count', 'id').first()
+    return {
+        'titles': (
+            Title.objects.select_related('category').prefetch_related(
+                Prefetch('genre', queryset=Genre.objects.order_by('id'))
+            ).order_by('id'),
+            TitleReadSerializer,
+            TitleFastSerializer,
+        ),
+        'reviews': (
+            Review.objects.filter(title=title).select_related(
+                'author'
+            ).order_by('pub_date', 'id'),
+            ReviewSerializer,
+            ReviewFastSerializer,
+        ),
+        'comments': (
+            Comment.objects.filter(review=review).select_related(
+                'author'
+            ).order_by('pub_date', 'id'),
+            CommentSerializer,
+            CommentFastSerializer,
+        ),
+    }
+
+
+def serialize_drf(page, serializer_class, fast_class):
+    return serializer_class(list(page), many=True).data
+
+
+def serialize_fast(page, serializer_class, fast_class):
+    serializer = fast_class()
+    return serializer.to_representation(list(serializer.prepare(page)))
+
+
+def measure_serialization(items=100, repeat=20):
+    """Процессорное время на объект: сериализаторы DRF и быстрый путь.
+
+    В замер входят выборка страницы и её сериализация, как в list().
+    Оба пути предварительно прогреваются одним вызовом.
+    """
+    report = {}
+    for name, (queryset, *classes) in serialization_cases().items():
+        count = queryset[:items].count()
+        if not count:
+            continue
+        metrics = {'items': count}
+        for label, serialize in (('drf', serialize_drf),
+                                 ('fast', serialize_fast)):
+            # Срез создаётся заново, чтобы каждый вызов ходил в базу.
+            serialize(queryset[:items], *classes)
+            started = time.process_time()
+            for _ in range(repeat):
+                serialize(queryset[:items], *classes)
+            elapsed = time.process_time() - started
+            metrics[f'{label}_us_per_item'] = elapsed / repeat / count * 1e6
+        metrics['speedup'] = (
+            metrics['drf_us_per_item'] / metrics['fast_us_per_item']
+            if metrics['fast_us_per_item'] else None
+        )
+        report[name] = metrics
+    return report
+
+
+@contextmanager
+def database_copy():
+    """Подменяет основную базу её копией во временном файле SQLite.
+
+    Реплики на время прогона отключаются: они зеркалят исходную базу,
+    а не копию.
+    """
+    original = connections[DEFAULT_DB_ALIAS]
+    if original.vendor != 'sqlite':
+        raise ValueError('Бенчмарк запускается только на SQLite')
+    directory = tempfile.mkdtemp(prefix='yamdb-bench-')
+    path = os.path.join(directory, 'db.sqlite3')
+    original.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        original.connection.backup(target)
+    finally:
+        target.close()
+    copy = load_backend(original.settings_dict['ENGINE']).DatabaseWrapper(
+        {**original.settings_dict, 'NAME': path}, DEFAULT_DB_ALIAS
+    )
+    connections[DEFAULT_DB_ALIAS] = copy
+    try:
+        with override_settings(DATABASE_REPLICAS=[]):
+            yield
+    finally:
+        copy.close()
+        connections[DEFAULT_DB_ALIAS] = original
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def clear_caches():
+    """Сбрасывает кэш ответов и поколений и снимки слагов процесса."""
+    cache.clear()
+    for slug_map in SLUG_MAPS.values():
+        slug_map.clear()
+
+
+def run_benchmark(iterations=100, warmup=5, cold=False, only=None):
+    """Прогоняет сценарии и возвращает отчёт, пригодный для JSON."""
+    report = {
+        'dataset': {
+            'users': User.objects.count(),
+            'titles': Title.objects.count(),
+            'reviews': Review.objects.count(),
+            'comments': Comment.objects.count(),
+        },
+        'iterations': iterations,
+        'cold_cache': cold,
+        'scenarios': {},
+    }
+    try:
+        with database_copy():
+            user = User.objects.create(
+                username=BENCH_USERNAME,
+                email=f'{BENCH_USERNAME}@yamdb.fake',
+                confirmation_code=BENCH_CODE,
+            )
+            user_client = APIClient()
+            user_client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+            )
+            clients = {'anonymous': APIClient(), 'user': user_client}
+            for scenario in build_scenarios(warmup + iterations):
+                if only and scenario.name not in only:
+                    continue
+                report['scenarios'][scenario.name] = measure(
+                    scenario, clients, iterations, warmup, cold
+                )
+            report['serialization'] = measure_serialization()
+    finally:
+        clear_caches()
+    return report
+
+
+def compare(report, baseline):
+    """Относительное изменение метрик по сравнению с базовым отчётом."""
+    deltas = {}
+    for name, metrics in report['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        deltas[name] = {
+            key: (metrics[key] - base[key]) / base[key] * 100
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+            if base.get(key)
+        }
+    return deltas
@@ -0,0 +1,131 @@
+"""Пакетное создание и изменение произведений одним запросом.
+
+Элемент с id частично изменяет существующее произведение, без id —
+создаёт новое. Сначала проверяются все элементы, и только если ошибок
+нет, всё записывается в одной транзакции через bulk_create/bulk_update.
+Сигналы post_save при этом не отправляются: поколение каталога
+сдвигается после фиксации транзакции.
+"""
+from django.db import connection, transaction
+from django.db.models import Max
+
+from reviews.models import Title
+from .cache import bump_generation_on_commit
+from .serializers import TitleWriteSerializer
+from .slugs import category_slugs, genre_slugs
+
+INSERT_BATCH_SIZE = 500
+
+
+def is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def preload_slugs(items):
+    """Разрешает slug всех элементов разом, по запросу на модель."""
+    genres, categories = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get('category'), str):
+            categories.append(item['category'])
+        if isinstance(item.get('genre'), list):
+            genres.extend(
+                slug for slug in item['genre'] if isinstance(slug, str)
+            )
+    genre_slugs.resolve(genres)
+    category_slugs.resolve(categories)
+
+
+def validate_titles(items, context=None):
+    """Сериализаторы элементов и список ошибок по их индексам."""
+    ids = [
+        item['id'] for item in items
+        if isinstance(item, dict) and is_id(item.get('id'))
+    ]
+    existing = Title.objects.in_bulk(ids)
+    preload_slugs(items)
+    serializers, errors, seen = [], [], set()
+    for item in items:
+        title_id = item.get('id') if isinstance(item, dict) else None
+        instance = None
+        if title_id is not None:
+            if not is_id(title_id):
+                error = 'Ожидается целое число.'
+            elif title_id not in existing:
+                error = 'Произведение не найдено.'
+            elif title_id in seen:
+                error = 'Произведение уже изменяется в этом пакете.'
+            else:
+                error = None
+                instance = existing[title_id]
+                seen.add(title_id)
+            if error is not None:
+                serializers.append(None)
+                errors.append({'id': [error]})
+                continue
+        serializer = TitleWriteSerializer(
+            instance, data=item, partial=instance is not None,
+            context=context
+        )
+        serializer.is_valid()
+        serializers.append(serializer)
+        errors.append(serializer.errors)
+    return serializers, errors
+
+
+def insert_titles(titles):
+    if connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.bulk_create(titles, batch_size=INSERT_BATCH_SIZE)
+        return
+    # Django 3.2 не получает id из bulk_create в SQLite. SQLite пишет
+    # по одной транзакции за раз, а AUTOINCREMENT выдаёт id по порядку,
+    # поэтому новые id — все, что больше прежнего максимума.
+    last = Title.objects.aggregate(last=Max('pk'))['last'] or 0
+    Title.objects.bulk_create(titles, batch_size=INSERT_BATCH_SIZE)
+    ids = Title.objects.filter(pk__gt=last).order_by('pk').values_list(
+        'pk', flat=True
+    )
+    for title, pk in zip(titles, ids):
+        title.pk = pk
+
+
+def save_titles(serializers):
+    """Записывает проверенные элементы, возвращает результаты по порядку."""
+    created, updated, update_fields = [], [], set()
+    titles = []
+    for serializer in serializers:
+        data = dict(serializer.validated_data)
+        genres = data.pop('genre', None)
+        title = serializer.instance
+        if title is None:
+            title = Title(**data)
+            created.append(title)
+            status = 'created'
+        else:
+            for name, value in data.items():
+                setattr(title, name, value)
+            update_fields.update(data)
+            updated.append(title)
+            status = 'updated'
+        titles.append((title, genres, status))
+
+    through = Title.genre.through
+    with transaction.atomic():
+        insert_titles(created)
+        if updated and update_fields:
+            Title.objects.bulk_update(updated, sorted(update_fields))
+        through.objects.filter(title_id__in=[
+            title.pk for title, genres, status in titles
+            if genres is not None and status == 'updated'
+        ]).delete()
+        through.objects.bulk_create([
+            through(title_id=title.pk, genre_id=genre_id)
+            for title, genres, _ in titles if genres is not None
+            for genre_id in dict.fromkeys(genre.pk for genre in genres)
+        ])
+        # bulk_create и bulk_update не отправляют сигналов.
+        bump_generation_on_commit('title')
+    return [
+        {'id': title.pk, 'status': status} for title, _, status in titles
+    ]
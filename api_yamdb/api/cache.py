@@ -0,0 +1,183 @@
+"""Кэш ответов каталога с инвалидацией через счётчики поколений.
+
+Каждая модель каталога имеет своё поколение — момент последнего
+изменения в наносекундах. Ключ кэшированного ответа включает поколения
+всех моделей, от которых зависит ответ, поэтому изменение любой из них
+делает старые записи недостижимыми без явного удаления. Те же поколения
+служат версиями для ETag и Last-Modified, но только если кэш общий для
+всех процессов: в LocMemCache воркер не видит чужих сдвигов поколений.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+from rest_framework.response import Response
+
+from api_yamdb.routers import ReplicaReadMixin
+
+GENERATION_KEY = 'yamdb:generation:{}'
+RESPONSE_KEY = 'yamdb:response:{}:{}'
+# Бэкенды, которые хранят поколения отдельно в каждом процессе.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def get_generation_timeout(scope):
+    """Поколения моделей бессрочны, поколения отдельных объектов — нет."""
+    if ':' in scope:
+        return settings.CACHE_OBJECT_GENERATION_TIMEOUT
+    return None
+
+
+def get_generations(*scopes):
+    """Возвращает поколения областей, заводя недостающие."""
+    keys = [GENERATION_KEY.format(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    for scope, key in zip(scopes, keys):
+        if key not in generations:
+            # После вытеснения из кэша поколение начинается заново
+            # с текущего момента, а не с нуля, чтобы не совпасть со старым.
+            cache.add(
+                key, time.time_ns(), timeout=get_generation_timeout(scope)
+            )
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(*scopes):
+    now = time.time_ns()
+    for scope in scopes:
+        cache.set(
+            GENERATION_KEY.format(scope), now,
+            timeout=get_generation_timeout(scope)
+        )
+
+
+def recently_changed(*scopes):
+    """Сдвигалось ли поколение какой-то из областей за REPLICA_MAX_LAG."""
+    generations = get_generations(*scopes)
+    threshold = time.time_ns() - settings.REPLICA_MAX_LAG * 10 ** 9
+    return any(generation > threshold for generation in generations)
+
+
+def bump_generation_on_commit(*scopes, using=None):
+    """Сдвигает поколения после фиксации текущей транзакции.
+
+    Сдвиг до фиксации позволил бы параллельному запросу прочитать ещё
+    старые данные и закэшировать их под новым поколением.
+    """
+    transaction.on_commit(lambda: bump_generation(*scopes), using=using)
+
+
+def generations_are_shared():
+    """Видят ли все процессы одни и те же поколения."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], PROCESS_LOCAL_CACHES)
+
+
+def get_request_key(request):
+    """Ключ запроса: схема, хост, путь и отсортированные параметры."""
+    query = urlencode(sorted(
+        (key, sorted(values)) for key, values in request.GET.lists()
+    ), doseq=True)
+    return request.build_absolute_uri(request.path) + '?' + query
+
+
+def get_response_key(request, scopes):
+    generations = ':'.join(str(gen) for gen in get_generations(*scopes))
+    digest = hashlib.md5(get_request_key(request).encode('utf-8'))
+    return RESPONSE_KEY.format(generations, digest.hexdigest())
+
+
+class FreshReplicaReadMixin(ReplicaReadMixin):
+    """Читает с реплик, только если они успели получить изменения.
+
+    Поколение сдвигается сразу после фиксации на основной базе, а реплика
+    может отставать. Прочитанный с неё старый ответ попал бы в кэш и ETag
+    под новым поколением, поэтому REPLICA_MAX_LAG секунд после изменения
+    областей вьюсета запросы читают с основной базы.
+    """
+
+    cache_scopes = ()
+
+    def get_version_scopes(self):
+        return self.cache_scopes
+
+    def use_replicas(self, request):
+        return (
+            super().use_replicas(request)
+            and bool(settings.DATABASE_REPLICAS)
+            and not recently_changed(*self.get_version_scopes())
+        )
+
+
+class CachedListMixin:
+    """Отдаёт списки из кэша, пока не изменилась ни одна из cache_scopes."""
+
+    cache_scopes = ()
+
+    def list(self, request, *args, **kwargs):
+        key = get_response_key(request, self.cache_scopes)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 по If-None-Match/If-Modified-Since до сериализации.
+
+    Версия ресурса берётся из поколений get_version_scopes(), поэтому
+    ни запрос к БД, ни сериализация для проверки не нужны. С кэшем
+    в памяти процесса заголовки не выдаются: другой воркер не узнал бы
+    об изменении и отвечал бы 304 на устаревшую версию.
+    """
+
+    def get_version_scopes(self):
+        return self.cache_scopes
+
+    def get_validators(self, request):
+        """ETag и Last-Modified; None, если выдавать их нельзя."""
+        if not generations_are_shared():
+            return None, None
+        generations = get_generations(*self.get_version_scopes())
+        digest = hashlib.md5(':'.join(
+            [get_request_key(request), request.META.get('HTTP_ACCEPT', '')]
+            + [str(gen) for gen in generations]
+        ).encode('utf-8')).hexdigest()
+        last_modified = max(generations) // 10 ** 9
+        # Last-Modified точен до секунды: пока она не истекла, следующее
+        # изменение получило бы то же значение, и If-Modified-Since
+        # вернул бы 304 на устаревшую версию.
+        if last_modified >= time.time_ns() // 10 ** 9:
+            last_modified = None
+        return f'W/"{digest}"', last_modified
+
+    def conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,147 @@
+"""Быстрая сериализация списков из .values() без моделей и полей DRF.
+
+Каждый класс повторяет вывод своего ModelSerializer байт в байт: поля
+и их порядок берутся из исходного сериализатора, а нетривиальные
+преобразования (даты) выполняют те же поля DRF. Создание экземпляров
+моделей и вызов to_representation для каждого поля каждой строки
+заменяются заранее подготовленными функциями доступа к словарю.
+"""
+from operator import itemgetter
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from reviews.models import Title
+from .serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleReadSerializer,
+)
+
+
+def get_converter(field):
+    if isinstance(field, serializers.DateTimeField):
+        return field.to_representation
+    if isinstance(field, serializers.IntegerField):
+        return int
+    # CharField и SlugRelatedField отдают строку из БД без изменений.
+    return None
+
+
+class FastListSerializer:
+    serializer_class = None
+    # Имя поля сериализатора -> путь для .values(), если они различаются.
+    sources = {}
+    _declared_fields = None
+
+    def __init__(self, fields=None):
+        declared = self.get_declared_fields()
+        self.names = [
+            name for name in declared if fields is None or name in fields
+        ]
+        self.columns = set()
+        self.getters = [
+            self.get_getter(name, declared[name]) for name in self.names
+        ]
+
+    @classmethod
+    def get_declared_fields(cls):
+        if cls.__dict__.get('_declared_fields') is None:
+            cls._declared_fields = cls.serializer_class().fields
+        return cls._declared_fields
+
+    def get_getter(self, name, field):
+        source = self.sources.get(name, name)
+        self.columns.add(source)
+        convert = get_converter(field)
+        if convert is None:
+            return itemgetter(source)
+
+        def getter(row):
+            value = row[source]
+            return None if value is None else convert(value)
+        return getter
+
+    def prepare(self, queryset):
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def load_related(self, rows):
+        pass
+
+    def to_representation(self, rows):
+        self.load_related(rows)
+        names, getters = self.names, self.getters
+        return [
+            {name: getter(row) for name, getter in zip(names, getters)}
+            for row in rows
+        ]
+
+
+class ReviewFastSerializer(FastListSerializer):
+    serializer_class = ReviewSerializer
+    sources = {'author': 'author__username'}
+
+
+class CommentFastSerializer(FastListSerializer):
+    serializer_class = CommentSerializer
+    sources = {'author': 'author__username'}
+
+
+class TitleFastSerializer(FastListSerializer):
+    """Категория берётся JOIN'ом, жанры страницы — одним запросом."""
+
+    serializer_class = TitleReadSerializer
+
+    def get_getter(self, name, field):
+        if name == 'category':
+            nested = [(key, f'category__{key}') for key in field.fields]
+            self.columns.add('category_id')
+            self.columns.update(source for _, source in nested)
+
+            def category(row):
+                if row['category_id'] is None:
+                    return None
+                return {key: row[source] for key, source in nested}
+            return category
+        if name == 'genre':
+            self.genre_fields = list(field.child.fields)
+            self.columns.add('id')
+            self.genres = {}
+            return lambda row: self.genres.get(row['id'], [])
+        return super().get_getter(name, field)
+
+    def load_related(self, rows):
+        if 'genre' not in self.names:
+            return
+        self.genres = {}
+        links = Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('genre_id').values_list(
+            'title_id', *(f'genre__{key}' for key in self.genre_fields)
+        )
+        for title_id, *values in links:
+            self.genres.setdefault(title_id, []).append(
+                dict(zip(self.genre_fields, values))
+            )
+
+
+class FastListMixin:
+    """Отдаёт list через быстрый сериализатор, если он включён."""
+
+    fast_serializer_class = None
+
+    def get_fast_serializer(self):
+        return self.fast_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_fast_serializer()
+        rows = serializer.prepare(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(list(rows)))
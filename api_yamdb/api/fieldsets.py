@@ -0,0 +1,77 @@
+"""Выборочные поля ответа: ?fields=id,name и ?omit=description."""
+from functools import lru_cache
+
+from rest_framework.exceptions import ValidationError
+
+
+@lru_cache(maxsize=None)
+def get_field_names(serializer_class):
+    return tuple(serializer_class().fields)
+
+
+def parse_field_names(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsSerializerMixin:
+    """Оставляет у сериализатора только поля из аргумента fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """Разбирает fields/omit для чтения и передаёт их сериализаторам.
+
+    get_requested_fields() возвращает None, если нужны все поля, иначе
+    список полей в порядке сериализатора; по нему вьюсет может сузить
+    и сам запрос к базе.
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    sparse_actions = ('list', 'retrieve')
+
+    def get_requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def parse_requested_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        params = self.request.query_params
+        fields = parse_field_names(params.get(self.fields_query_param, ''))
+        omit = parse_field_names(params.get(self.omit_query_param, ''))
+        if not fields and not omit:
+            return None
+        available = get_field_names(self.get_serializer_class())
+        errors = {}
+        for param, names in (
+            (self.fields_query_param, fields),
+            (self.omit_query_param, omit),
+        ):
+            unknown = names.difference(available)
+            if unknown:
+                errors[param] = (
+                    'Неизвестные поля: ' + ', '.join(sorted(unknown))
+                )
+        if errors:
+            raise ValidationError(errors)
+        selected = [
+            name for name in available
+            if (not fields or name in fields) and name not in omit
+        ]
+        return None if len(selected) == len(available) else selected
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def get_fast_serializer(self):
+        return self.fast_serializer_class(fields=self.get_requested_fields())
@@ -1,25 +1,82 @@
 from django_filters import rest_framework as filters
 from reviews.models import Title
+from reviews.search import search_titles
+
+MATCH_CHOICES = (('any', 'any'), ('all', 'all'))
+
+
+def split_slugs(value):
+    return sorted({slug.strip() for slug in value.split(',') if slug.strip()})
+
+
+def genre_title_ids(**lookups):
+    """Подзапрос id произведений, у которых есть жанр с lookups.
+
+    Подзапрос не связан с внешним, поэтому SQLite выполняет его один раз
+    по индексу (genre_id, title_id) и ищет произведения по первичному
+    ключу в порядке id, без просмотра всей таблицы.
+    """
+    return Title.genre.through.objects.filter(**{
+        f'genre__{lookup}': value for lookup, value in lookups.items()
+    }).values('title_id')
 
 
 class TitleFilter(filters.FilterSet):
+    """Фильтр произведений.
+
+    category и genre сравнивают slug точно и принимают несколько
+    значений через запятую; произведение подходит, если совпал любой
+    slug, а при genre_match=all — все жанры. Жанры проверяются через
+    id__in по подзапросу, поэтому строки произведений не размножаются.
+    Поиск по подстроке — явные category__icontains и genre__icontains.
+    """
+
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='contains'
     )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    category = filters.CharFilter(method='filter_category')
+    category__icontains = filters.CharFilter(method='filter_category')
+    genre = filters.CharFilter(method='filter_genre')
+    genre__icontains = filters.CharFilter(method='filter_genre')
+    genre_match = filters.ChoiceFilter(
+        choices=MATCH_CHOICES, method='filter_genre_match'
     )
     year = filters.NumberFilter(
         field_name="year",
         lookup_expr='exact'
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'category', 'genre', 'year')
+        fields = (
+            'name', 'category', 'category__icontains', 'genre',
+            'genre__icontains', 'genre_match', 'year', 'search',
+        )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+    def filter_category(self, queryset, name, value):
+        # Соединение, а не подзапрос: для одной категории SQLite берёт
+        # строки из индекса по category_id уже в порядке id.
+        if name == 'category__icontains':
+            return queryset.filter(category__slug__icontains=value)
+        return queryset.filter(category__slug__in=split_slugs(value))
+
+    def filter_genre(self, queryset, name, value):
+        if name == 'genre__icontains':
+            return queryset.filter(
+                id__in=genre_title_ids(slug__icontains=value)
+            )
+        slugs = split_slugs(value)
+        if self.form.cleaned_data.get('genre_match') == 'all':
+            for slug in slugs:
+                queryset = queryset.filter(id__in=genre_title_ids(slug=slug))
+            return queryset
+        return queryset.filter(id__in=genre_title_ids(slug__in=slugs))
+
+    def filter_genre_match(self, queryset, name, value):
+        # Учитывается в filter_genre.
+        return queryset
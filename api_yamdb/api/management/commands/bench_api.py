@@ -0,0 +1,73 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from api.benchmark import compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark API endpoints in-process and report latency as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Очищать кэш перед каждым запросом'
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            help='Запустить только указанные сценарии'
+        )
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+        parser.add_argument('--baseline', help='JSON-отчёт для сравнения')
+        parser.add_argument(
+            '--max-regression',
+            type=float,
+            help='Допустимый рост p95 относительно baseline, в процентах'
+        )
+
+    def handle(self, *args, **options):
+        # Тестовое окружение разрешает хост testserver и подменяет
+        # отправку почты на locmem.
+        setup_test_environment()
+        try:
+            report = run_benchmark(
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                cold=options['cold'],
+                only=options['scenarios'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        finally:
+            teardown_test_environment()
+
+        regressions = []
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                report['baseline_delta_pct'] = compare(report, json.load(file))
+            limit = options['max_regression']
+            if limit is not None:
+                regressions = [
+                    name for name, delta
+                    in report['baseline_delta_pct'].items()
+                    if delta.get('p95_ms', 0) > limit
+                ]
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        self.stdout.write(output)
+        if regressions:
+            raise CommandError(
+                'Регрессия p95 в сценариях: ' + ', '.join(regressions)
+            )
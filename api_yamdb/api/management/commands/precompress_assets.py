@@ -0,0 +1,45 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from api_yamdb.compression import (
+    available_encodings,
+    compress_chunks,
+    get_precompressed_path,
+    iter_slices,
+)
+
+# Максимальная степень сжатия: файлы сжимаются один раз.
+LEVELS = {'br': 11, 'gzip': 9}
+
+
+def read_asset(name):
+    """Содержимое статического файла или отрендеренного шаблона."""
+    path = finders.find(name)
+    if path is not None:
+        with open(path, 'rb') as file:
+            return file.read()
+    return render_to_string(name).encode('utf-8')
+
+
+class Command(BaseCommand):
+    help = 'Precompress PRECOMPRESSED_ASSETS with gzip and brotli'
+
+    def handle(self, *args, **options):
+        os.makedirs(settings.PRECOMPRESSED_ROOT, exist_ok=True)
+        for name in sorted(set(settings.PRECOMPRESSED_ASSETS.values())):
+            content = read_asset(name)
+            for encoding in available_encodings():
+                path = get_precompressed_path(name, encoding)
+                compressed = b''.join(compress_chunks(
+                    iter_slices(content), encoding, LEVELS[encoding]
+                ))
+                with open(path, 'wb') as file:
+                    file.write(compressed)
+                print(
+                    f'{name}: {len(content)} -> {len(compressed)} байт '
+                    f'({encoding})'
+                )
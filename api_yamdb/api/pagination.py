@@ -0,0 +1,152 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная пагинация по (pub_date, id) без OFFSET и COUNT(*)."""
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = 100
+    invalid_cursor_message = 'Неверный курсор.'
+    # Больший id не поместится в целочисленную колонку базы.
+    max_pk = 2 ** 63 - 1
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        position, self.reverse = self.decode_cursor(request)
+
+        if self.reverse:
+            queryset = queryset.order_by('-pub_date', '-id')
+        else:
+            queryset = queryset.order_by('pub_date', 'id')
+        if position is not None:
+            pub_date, pk = position
+            if self.reverse:
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+                )
+
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if self.reverse:
+            page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous = position is not None
+            self.has_next = has_more
+        self.page = page
+        return page
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii'))
+            direction, pub_date, pk = raw.decode('ascii').split('|')
+            pub_date = datetime.fromisoformat(pub_date)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            direction not in ('n', 'p')
+            or pub_date.tzinfo is None
+            or not pk.isdigit()
+            or int(pk) > self.max_pk
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return (pub_date, int(pk)), direction == 'p'
+
+    def encode_cursor(self, item, reverse):
+        # Страница состоит из моделей или из словарей быстрого пути.
+        if isinstance(item, dict):
+            pub_date, pk = item['pub_date'], item['id']
+        else:
+            pub_date, pk = item.pub_date, item.pk
+        raw = '|'.join((
+            'p' if reverse else 'n', pub_date.isoformat(), str(pk)
+        ))
+        encoded = base64.urlsafe_b64encode(raw.encode('ascii'))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode('ascii')
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """Limit/offset по умолчанию, курсор — по ?cursor= или ?pagination=cursor.
+
+    Старые клиенты продолжают получать count/next/previous/results,
+    новые переходят на курсоры, стоимость которых не растёт с глубиной.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_requested(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def keyset_requested(self, request):
+        return (
+            self.keyset_class.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,57 @@
+import codecs
+import io
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson для тел запросов в UTF-8.
+
+    Всё, что orjson не принимает, разбирается стандартным парсером DRF,
+    поэтому сообщения об ошибках и поведение остаются прежними.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(
+                io.BytesIO(body), media_type, parser_context
+            )
+
+
+class NDJSONParser(BaseParser):
+    """Тело из JSON-объектов по одному в строке; возвращает список."""
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        loads = json.loads if orjson is None else orjson.loads
+        try:
+            lines = stream.read().decode(encoding).split('\n')
+        except UnicodeDecodeError as exc:
+            raise ParseError(f'Тело не в кодировке {encoding}: {exc}')
+        items = []
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(loads(line))
+            except ValueError as exc:
+                raise ParseError(f'Строка {number}: {exc}')
+        return items
@@ -2,6 +2,8 @@ from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
 from reviews.models import User, Category, Genre, Title, Comment, Review
+from .fieldsets import SparseFieldsSerializerMixin
+from .slugs import CachedSlugRelatedField, category_slugs, genre_slugs
 
 
 class SignupSerializer(serializers.ModelSerializer):
@@ -110,7 +112,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(
         read_only=True,
@@ -119,21 +123,16 @@ class TitleReadSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        fields = (
+            'id', 'category', 'genre', 'rating', 'name', 'year', 'description',
+        )
         model = Title
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
-    )
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(),
-        slug_field='slug',
-        many=True
-    )
+    category = CachedSlugRelatedField(category_slugs)
+    genre = CachedSlugRelatedField(genre_slugs, many=True)
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'category', 'genre', 'name', 'year', 'description')
         model = Title
@@ -0,0 +1,68 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleGenre,
+    User,
+)
+from .authentication import forget_user
+from .cache import bump_generation_on_commit
+from .slugs import SLUG_MAPS
+
+CACHE_SCOPES = {
+    Category: 'category',
+    Genre: 'genre',
+    Title: 'title',
+    # Строки связи, сохранённые напрямую, а не через title.genre.
+    TitleGenre: 'title',
+    Review: 'review',
+}
+
+
+def bump_catalog_generation(sender, using, **kwargs):
+    scope = CACHE_SCOPES.get(sender)
+    if scope is not None:
+        bump_generation_on_commit(scope, using=using)
+    slug_map = SLUG_MAPS.get(sender)
+    if slug_map is not None:
+        slug_map.clear()
+
+
+# Только для моделей каталога: обработчик post_delete без sender лишил бы
+# быстрого удаления все модели, включая таблицы рейтингов и соседей.
+for model in {**CACHE_SCOPES, **SLUG_MAPS}:
+    post_save.connect(bump_catalog_generation, sender=model)
+    post_delete.connect(bump_catalog_generation, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genres_generation(sender, action, using, **kwargs):
+    if action.startswith('post_'):
+        bump_generation_on_commit('title', using=using)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_title_reviews_generation(sender, instance, using, **kwargs):
+    bump_generation_on_commit(
+        f'review:title:{instance.title_id}', using=using
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_review_comments_generation(sender, instance, using, **kwargs):
+    bump_generation_on_commit(
+        f'comment:review:{instance.review_id}', using=using
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
@@ -0,0 +1,113 @@
+"""Поиск жанров и категорий по slug через карту в памяти процесса.
+
+Карта slug → снимок объекта заполняется по мере обращений: все
+неизвестные ей slug запроса догружаются одним запросом IN. Изменения
+в этом процессе очищают карту сигналом, а изменения в других процессах
+замечаются по поколению кэша модели (см. api.cache).
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from reviews.models import Category, Genre
+from .cache import get_generations
+
+
+class SlugMap:
+    """Снимки объектов модели по slug в памяти процесса."""
+
+    def __init__(self, model, scope):
+        self.model = model
+        self.scope = scope
+        self.field_names = [
+            field.attname for field in model._meta.concrete_fields
+        ]
+        self.slug_index = self.field_names.index('slug')
+        self.snapshots = {}
+        self.generation = None
+
+    def __deepcopy__(self, memo):
+        # DRF копирует поля сериализатора вместе с аргументами,
+        # а карта должна оставаться общей для процесса.
+        return self
+
+    def clear(self):
+        self.snapshots = {}
+
+    def check_generation(self):
+        generation, = get_generations(self.scope)
+        if generation != self.generation:
+            self.snapshots = {}
+            self.generation = generation
+
+    def resolve(self, slugs):
+        """{slug: объект} для найденных slug, не больше одного запроса."""
+        self.check_generation()
+        snapshots = self.snapshots
+        missing = {slug for slug in slugs if slug not in snapshots}
+        if missing:
+            for values in self.model.objects.filter(
+                slug__in=missing
+            ).values_list(*self.field_names):
+                snapshots[values[self.slug_index]] = values
+        return {
+            slug: self.model.from_db(
+                DEFAULT_DB_ALIAS, self.field_names, snapshots[slug]
+            )
+            for slug in slugs if slug in snapshots
+        }
+
+
+genre_slugs = SlugMap(Genre, 'genre')
+category_slugs = SlugMap(Category, 'category')
+SLUG_MAPS = {Genre: genre_slugs, Category: category_slugs}
+
+
+class CachedManySlugRelatedField(serializers.ManyRelatedField):
+    """Список slug, разрешаемый одним обращением к SlugMap."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        for slug in data:
+            child.check_slug(slug)
+        objects = child.slug_map.resolve(data)
+        return [child.get_resolved(objects, slug) for slug in data]
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объекты через SlugMap."""
+
+    def __init__(self, slug_map, **kwargs):
+        self.slug_map = slug_map
+        kwargs.setdefault('queryset', slug_map.model.objects.all())
+        kwargs.setdefault('slug_field', 'slug')
+        super().__init__(**kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CachedManySlugRelatedField(**list_kwargs)
+
+    def check_slug(self, slug):
+        if not isinstance(slug, str):
+            self.fail('invalid')
+
+    def get_resolved(self, objects, slug):
+        if slug not in objects:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(slug)
+            )
+        return objects[slug]
+
+    def to_internal_value(self, data):
+        self.check_slug(data)
+        return self.get_resolved(self.slug_map.resolve([data]), data)
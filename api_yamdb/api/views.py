@@ -1,20 +1,39 @@
 import string
 import random
 
+from django.conf import settings
 from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import _positive_int
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
 from reviews.models import Category, Genre, Review, Title, User
+from reviews.rankings import TOP, TRENDING, category_board, genre_board
+from .bulk import save_titles, validate_titles
+from .cache import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    FreshReplicaReadMixin,
+)
+from .facets import TITLE_FACETS, FacetMixin
+from .fast_serializers import (
+    CommentFastSerializer,
+    FastListMixin,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
+from .fieldsets import SparseFieldsMixin
 from .filters import TitleFilter
+from .pagination import LimitOffsetOrKeysetPagination
+from .parsers import FastJSONParser, NDJSONParser
 from .permissions import (
     AdminModeratorAuthorPermission,
     AdminOnly,
@@ -36,6 +55,8 @@ from .constants import CONFIRMATION_CODE_LENGTH
 
 
 class CreateDestroyListViewSet(
+    FreshReplicaReadMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -70,24 +91,145 @@ def get_token(request):
 class CategoryViewSet(CreateDestroyListViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_scopes = ('category',)
 
 
 class GenreViewSet(CreateDestroyListViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_scopes = ('genre',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+class TitleViewSet(
+    FreshReplicaReadMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    FacetMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    viewsets.ModelViewSet
+):
+    # Жанры упорядочены по id так же, как в быстром сериализаторе.
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('id'))
+    ).order_by('id')
     permission_classes = [AdminOrReadOnly]
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cache_scopes = ('title', 'category', 'genre', 'review')
+    fast_serializer_class = TitleFastSerializer
+    facets = TITLE_FACETS
+    sparse_actions = ('list', 'retrieve', 'top', 'trending', 'similar')
+    # Нечисловой id не доходит до запросов к базе, в том числе в similar.
+    lookup_value_regex = r'\d+'
+    ranking_limit = 10
+    # Поля произведения, которые хранятся в его собственной таблице.
+    title_columns = ('name', 'year', 'description', 'rating')
+
+    def get_queryset(self):
+        fields = self.get_requested_fields()
+        if fields is None:
+            return super().get_queryset()
+        queryset = Title.objects.order_by('id')
+        columns = ['id']
+        columns.extend(name for name in fields if name in self.title_columns)
+        if 'category' in fields:
+            queryset = queryset.select_related('category')
+            columns.extend(('category__name', 'category__slug'))
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch('genre', queryset=Genre.objects.order_by('id'))
+            )
+        return queryset.only(*columns)
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in self.sparse_actions:
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(detail=False)
+    def top(self, request):
+        """Лучшие произведения, в целом или в категории либо жанре."""
+        category = request.query_params.get('category')
+        genre = request.query_params.get('genre')
+        if category and genre:
+            raise ValidationError('Укажите либо категорию, либо жанр.')
+        if category:
+            category = get_object_or_404(Category, slug=category)
+            return self.get_ranking_response(category_board(category.id))
+        if genre:
+            genre = get_object_or_404(Genre, slug=genre)
+            return self.get_ranking_response(genre_board(genre.id))
+        return self.get_ranking_response(TOP)
+
+    @action(detail=False)
+    def trending(self, request):
+        """Лучшие по отзывам последних TRENDING_DAYS дней."""
+        return self.get_ranking_response(TRENDING)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=(AdminOnly,),
+        parser_classes=(FastJSONParser, NDJSONParser),
+    )
+    def bulk(self, request):
+        """Создание и изменение произведений пакетом: JSON-массив или NDJSON.
+
+        Записывается либо весь пакет, либо ничего: при ошибках ответ 400
+        с результатом проверки каждого элемента.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается список произведений.')
+        if len(items) > settings.TITLES_BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'Не больше {settings.TITLES_BULK_MAX_ITEMS} произведений '
+                'за запрос.'
+            )
+        serializers, errors = validate_titles(
+            items, self.get_serializer_context()
+        )
+        if any(errors):
+            return Response(
+                [
+                    {'status': 'invalid', 'errors': error} if error
+                    else {'status': 'valid'}
+                    for error in errors
+                ],
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(save_titles(serializers))
+
+    @action(detail=True)
+    def similar(self, request, pk=None):
+        """Похожие произведения из таблицы compute_similar_titles."""
+        limit = self.get_limit(settings.SIMILAR_TITLES_COUNT)
+        titles = self.get_queryset().filter(
+            similar_for__title_id=pk
+        ).order_by('similar_for__position')[:limit]
+        data = self.get_serializer(titles, many=True).data
+        if not data:
+            get_object_or_404(Title.objects.only('id'), pk=pk)
+        return Response(data)
+
+    def get_limit(self, maximum):
+        try:
+            return _positive_int(
+                self.request.query_params['limit'],
+                strict=True,
+                cutoff=maximum
+            )
+        except (KeyError, ValueError):
+            return min(self.ranking_limit, maximum)
+
+    def get_ranking_response(self, board):
+        limit = self.get_limit(settings.RANKING_SIZE)
+        titles = self.get_queryset().filter(
+            rankings__board=board
+        ).order_by('rankings__position')[:limit]
+        return Response(self.get_serializer(titles, many=True).data)
+
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
@@ -135,16 +277,19 @@ class UserViewSet(viewsets.ModelViewSet):
         url_name='me'
     )
     def user_me(self, request):
-        serializer = UserSerializer(request.user)
+        # В request.user из кэша загружены только поля для проверки прав,
+        # остальные подгружались бы по одному запросу на поле.
+        user = get_object_or_404(User, pk=request.user.pk)
+        serializer = UserSerializer(user)
         if request.method == 'PATCH':
-            if request.user.is_admin:
+            if user.is_admin:
                 serializer = AdminUserSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True)
             else:
                 serializer = UserSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True)
             serializer.is_valid(raise_exception=True)
@@ -153,15 +298,24 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    pagination_class = LimitOffsetPagination
+class CommentViewSet(
+    FreshReplicaReadMixin, ConditionalGetMixin, FastListMixin,
+    viewsets.ModelViewSet
+):
+    pagination_class = LimitOffsetOrKeysetPagination
     serializer_class = CommentSerializer
+    fast_serializer_class = CommentFastSerializer
     permission_classes = (AdminModeratorAuthorPermission,)
 
+    def get_version_scopes(self):
+        return (f'comment:review:{self.kwargs.get("review_id")}',)
+
     def get_queryset(self):
         review_id = self.kwargs.get('review_id')
         review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return review.comments.select_related('author').order_by(
+            'pub_date', 'id'
+        )
 
     def perform_create(self, serializer):
         review_id = self.kwargs.get('review_id')
@@ -169,10 +323,17 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=review)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
-    pagination_class = LimitOffsetPagination
+class ReviewViewSet(
+    FreshReplicaReadMixin, ConditionalGetMixin, FastListMixin,
+    viewsets.ModelViewSet
+):
+    pagination_class = LimitOffsetOrKeysetPagination
     permission_classes = (AdminModeratorAuthorPermission,)
     serializer_class = ReviewSerializer
+    fast_serializer_class = ReviewFastSerializer
+
+    def get_version_scopes(self):
+        return (f'review:title:{self.kwargs.get("title_id")}',)
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -180,5 +341,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         title_id = self.kwargs.get('title_id')
-        review_queryset = Review.objects.filter(title=title_id)
-        return review_queryset
+        review_queryset = Review.objects.filter(
+            title=title_id
+        ).select_related('author')
+        return review_queryset.order_by('pub_date', 'id')
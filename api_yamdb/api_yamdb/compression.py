@@ -0,0 +1,207 @@
+"""Сжатие ответов gzip/brotli и раздача заранее сжатых файлов."""
+import mimetypes
+import os
+import zlib
+from functools import lru_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.http import HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.cache import patch_vary_headers
+
+CHUNK_SIZE = 64 * 1024
+EXTENSIONS = {'br': 'br', 'gzip': 'gz'}
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/yaml',
+    'application/x-yaml',
+    'image/svg+xml',
+)
+
+
+def available_encodings():
+    """Поддерживаемые кодировки в порядке предпочтения."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(header):
+    """Кодировки из Accept-Encoding, которые можно отдать, лучшая первой."""
+    weights = {}
+    for item in header.split(','):
+        name, *params = item.strip().lower().split(';')
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.strip()] = weight
+    accepted = [
+        encoding for encoding in available_encodings()
+        if weights.get(encoding, weights.get('*', 0.0)) > 0
+    ]
+    return sorted(
+        accepted,
+        key=lambda encoding: -weights.get(encoding, weights.get('*', 0.0))
+    )
+
+
+def get_compressor(encoding, level=None):
+    """Пара функций (сжать фрагмент, завершить поток)."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(
+            quality=level or settings.COMPRESSION_BROTLI_QUALITY
+        )
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(
+        level or settings.COMPRESSION_GZIP_LEVEL,
+        zlib.DEFLATED,
+        16 + zlib.MAX_WBITS,
+    )
+    return compressor.compress, compressor.flush
+
+
+def compress_chunks(chunks, encoding, level=None):
+    compress, finish = get_compressor(encoding, level)
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def iter_slices(content, size=CHUNK_SIZE):
+    view = memoryview(content)
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return (
+        media_type.startswith('text/')
+        or media_type.endswith('+json')
+        or media_type in COMPRESSIBLE_TYPES
+    )
+
+
+def get_asset_content_type(name):
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if is_compressible(content_type):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def get_precompressed_path(name, encoding):
+    return os.path.join(
+        settings.PRECOMPRESSED_ROOT, f'{name}.{EXTENSIONS[encoding]}'
+    )
+
+
+@lru_cache(maxsize=None)
+def get_asset_source(name):
+    """Путь к исходнику ресурса: статическому файлу или шаблону."""
+    path = finders.find(name)
+    if path is not None:
+        return path
+    try:
+        return get_template(name).origin.name
+    except TemplateDoesNotExist:
+        return None
+
+
+def get_modified_time(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class CompressionMiddleware:
+    """Сжимает ответы больше COMPRESSION_MIN_SIZE по Accept-Encoding.
+
+    Тело сжимается потоковым компрессором по фрагментам, потоковые
+    ответы остаются потоковыми. Пути из PRECOMPRESSED_ASSETS отдаются
+    из файлов, подготовленных командой precompress_assets, если для
+    выбранной кодировки такой файл есть и он не старше исходника.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        encodings = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if (
+            request.method in ('GET', 'HEAD')
+            and request.path in settings.PRECOMPRESSED_ASSETS
+        ):
+            response = self.get_precompressed_response(
+                settings.PRECOMPRESSED_ASSETS[request.path], encodings
+            )
+            if response is not None:
+                return response
+        response = self.get_response(request)
+        self.compress(response, encodings[0] if encodings else None)
+        return response
+
+    def get_precompressed_response(self, name, encodings):
+        source = get_asset_source(name)
+        source_time = source and get_modified_time(source)
+        for encoding in encodings:
+            path = get_precompressed_path(name, encoding)
+            compressed_time = get_modified_time(path)
+            # Исходник изменился после precompress_assets: сжатый файл
+            # устарел, и ответ сжимается на лету.
+            if compressed_time is None or (
+                source_time is not None and compressed_time < source_time
+            ):
+                continue
+            with open(path, 'rb') as file:
+                response = HttpResponse(
+                    file.read(), content_type=get_asset_content_type(name)
+                )
+            response['Content-Encoding'] = encoding
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+        return None
+
+    def compress(self, response, encoding):
+        if (
+            response.has_header('Content-Encoding')
+            or not is_compressible(response.get('Content-Type', ''))
+        ):
+            return
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if encoding is None:
+            return
+        if response.streaming:
+            response.streaming_content = compress_chunks(
+                response.streaming_content, encoding
+            )
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+                return
+            compressed = b''.join(
+                compress_chunks(iter_slices(response.content), encoding)
+            )
+            if len(compressed) >= len(response.content):
+                return
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
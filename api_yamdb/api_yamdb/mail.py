@@ -0,0 +1,130 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger('api_yamdb.mail')
+
+
+class MailWorker(threading.Thread):
+    """Фоновый поток, отправляющий письма из очереди пачками.
+
+    Соединение с настоящим бэкендом открывается один раз и живёт, пока
+    в очереди есть письма; при ошибке повторяется только неотправленное.
+    """
+
+    idle_timeout = 5
+
+    def __init__(self):
+        super().__init__(name='mail-worker', daemon=True)
+        self.queue = queue.Queue()
+
+    def run(self):
+        connection = None
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.idle_timeout)]
+            except queue.Empty:
+                if connection is not None:
+                    self.close(connection)
+                    connection = None
+                continue
+            while len(batch) < settings.BACKGROUND_EMAIL_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                connection = self.deliver(connection, batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def deliver(self, connection, batch):
+        """Отправляет письма по одному через общее соединение.
+
+        SMTP мог успеть отправить часть пачки до ошибки, поэтому повторно
+        отправляется только письмо, на котором произошёл сбой, а не вся
+        пачка. После BACKGROUND_EMAIL_RETRIES повторов оно пропускается.
+        """
+        attempts = settings.BACKGROUND_EMAIL_RETRIES + 1
+        pending = list(batch)
+        failures = 0
+        while pending:
+            try:
+                if connection is None:
+                    connection = get_connection(
+                        settings.BACKGROUND_EMAIL_BACKEND,
+                        fail_silently=False
+                    )
+                    connection.open()
+                connection.send_messages(pending[:1])
+            except Exception:
+                failures += 1
+                logger.warning(
+                    'Не удалось отправить письмо для %s, попытка %d из %d',
+                    ', '.join(pending[0].to), failures, attempts,
+                    exc_info=True
+                )
+                if connection is not None:
+                    self.close(connection)
+                    connection = None
+                if failures < attempts:
+                    time.sleep(
+                        settings.BACKGROUND_EMAIL_RETRY_DELAY
+                        * 2 ** (failures - 1)
+                    )
+                    continue
+                logger.error(
+                    'Письмо для %s не отправлено', ', '.join(pending[0].to)
+                )
+            pending.pop(0)
+            failures = 0
+        return connection
+
+    def close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            logger.warning('Ошибка при закрытии соединения', exc_info=True)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = MailWorker()
+            _worker.start()
+        return _worker
+
+
+def flush():
+    """Ждёт, пока все поставленные в очередь письма будут обработаны."""
+    if _worker is not None:
+        _worker.queue.join()
+
+
+# Один раз на процесс: flush ждёт текущий поток, даже если он пересоздан.
+atexit.register(flush)
+
+
+class BackgroundEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь и сразу возвращает управление.
+
+    Настоящая отправка выполняется бэкендом BACKGROUND_EMAIL_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        worker = get_worker()
+        for message in email_messages:
+            worker.queue.put(message)
+        return len(email_messages)
@@ -0,0 +1,65 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api_yamdb.timing')
+
+
+class QueryStats:
+    """Обёртка execute_wrapper, копящая число запросов и время в БД."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class ServerTimingMiddleware:
+    """Добавляет в ответ Server-Timing с числом SQL-запросов и временем.
+
+    Работает без DEBUG: запросы считаются через execute_wrapper,
+    а не через connection.queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = (time.perf_counter() - started) * 1000
+        db = stats.duration * 1000
+        response['Server-Timing'] = (
+            f'db;dur={db:.3f};desc="{stats.count} queries", '
+            f'app;dur={total - db:.3f}, total;dur={total:.3f}'
+        )
+        if getattr(settings, 'SERVER_TIMING_LOG', False):
+            logger.info(
+                'method=%s path=%s status=%s queries=%d db_ms=%.3f '
+                'total_ms=%.3f',
+                request.method, request.path, response.status_code,
+                stats.count, db, total,
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    'queries': stats.count,
+                    'db_ms': db,
+                    'total_ms': total,
+                }
+            )
+        return response
@@ -0,0 +1,70 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+
+class ReplicaState:
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.pinned = False
+
+
+_state = ContextVar('replica_state', default=None)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Разрешает чтение с реплик до первой записи внутри блока."""
+    token = _state.set(ReplicaState(enabled))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Направляет чтение на реплики, а запись — на основную базу.
+
+    Реплики используются только внутри replica_reads(); после первой
+    записи чтение в том же блоке возвращается на основную базу, чтобы
+    видеть только что записанные данные.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.enabled
+            or state.pinned
+            or not settings.DATABASE_REPLICAS
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+class ReplicaReadMixin:
+    """Обрабатывает безопасные запросы вьюсета с чтением с реплик."""
+
+    def use_replicas(self, request):
+        return request.method in SAFE_METHODS
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads(self.use_replicas(request)):
+            return super().dispatch(request, *args, **kwargs)
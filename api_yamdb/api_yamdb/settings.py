@@ -30,6 +30,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.ServerTimingMiddleware',
+    'api_yamdb.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,13 +62,134 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
-DATABASES = {
+# DATABASE_PROFILE=production включает WAL, прагмы производительности
+# и постоянные соединения. При заданном POSTGRES_DB используется
+# PostgreSQL; DB_POOLER=pgbouncer готовит настройки к пулу транзакций.
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'development')
+
+PRODUCTION_DATABASE = DATABASE_PROFILE == 'production'
+
+if os.getenv('POSTGRES_DB'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.getenv('DB_POOLER') == 'pgbouncer'
+            ),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if PRODUCTION_DATABASE:
+        DATABASES['default'].update({
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+            'OPTIONS': {'timeout': 20},
+        })
+
+# Реплики для чтения: SQLITE_REPLICAS — пути к файлам через запятую,
+# для PostgreSQL — POSTGRES_REPLICA_HOSTS. В тестах реплики зеркалят
+# основную базу.
+if os.getenv('POSTGRES_DB'):
+    REPLICA_OVERRIDES = [
+        {'HOST': host}
+        for host in os.getenv('POSTGRES_REPLICA_HOSTS', '').split(',') if host
+    ]
+else:
+    REPLICA_OVERRIDES = [
+        {'NAME': path}
+        for path in os.getenv('SQLITE_REPLICAS', '').split(',') if path
+    ]
+
+DATABASE_REPLICAS = []
+for number, overrides in enumerate(REPLICA_OVERRIDES, 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        **overrides,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api_yamdb.routers.PrimaryReplicaRouter']
+
+# Сколько секунд после изменения данных вьюсеты читают с основной базы,
+# пока реплики могут их не получить (см. api.cache.FreshReplicaReadMixin).
+REPLICA_MAX_LAG = int(os.getenv('REPLICA_MAX_LAG', 5))
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+} if PRODUCTION_DATABASE else {}
+
+# LocMemCache работает в пределах одного процесса; при нескольких
+# воркерах используйте FileBasedCache, указав CACHE_LOCATION каталогом.
+# ETag и Last-Modified выдаются только с таким общим кэшем.
+# В кэше лежат поколения отзывов каждого произведения и комментариев
+# каждого отзыва. При стандартных 300 записях LocMemCache и FileBasedCache
+# вытесняют их случайно, а вытесненное поколение начинается заново —
+# ETag меняется, а чтение уходит с реплик. CACHE_MAX_ENTRIES должен
+# вмещать рабочий набор; FileBasedCache при переполнении обходит весь
+# каталог, поэтому слишком большой лимит замедлит запись.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 20000)),
+        },
     }
 }
 
+# Поколения отдельных произведений и отзывов живут ограниченное время,
+# чтобы не копиться для объектов, которые давно не читали. После
+# истечения поколение начинается заново: один промах кэша и новый ETag.
+CACHE_OBJECT_GENERATION_TIMEOUT = 60 * 60 * 24
+
+API_CACHE_TIMEOUT = 60 * 5
+
+USER_CACHE_TIMEOUT = 60
+
+# Вес априорной средней оценки в рейтингах rebuild_rankings: столько
+# «средних» отзывов добавляется к каждому произведению.
+RANKING_PRIOR_WEIGHT = 10
+
+RANKING_SIZE = 100
+
+TRENDING_DAYS = 7
+
+# Сколько похожих произведений хранит compute_similar_titles и веса
+# признаков в их сходстве.
+SIMILAR_TITLES_COUNT = 10
+
+SIMILARITY_WEIGHTS = {
+    'review': 0.6,
+    'genre': 0.3,
+    'category': 0.1,
+}
+
+# Списки произведений, отзывов и комментариев сериализуются из .values().
+FAST_LIST_SERIALIZATION = True
+
+# Сколько произведений принимает POST /api/v1/titles/bulk/ за раз.
+TITLES_BULK_MAX_ITEMS = 5000
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -99,10 +222,20 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    # Без установленного orjson работают как стандартные JSON-классы DRF.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -114,8 +247,52 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Ответы меньше этого размера (в байтах) не сжимаются.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+
+COMPRESSION_GZIP_LEVEL = 6
+
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Файлы, сжатые заранее командой precompress_assets: путь запроса ->
+# имя статического файла или шаблона.
+PRECOMPRESSED_ROOT = BASE_DIR / 'static' / 'precompressed'
+
+PRECOMPRESSED_ASSETS = {
+    '/static/redoc.yaml': 'redoc.yaml',
+    '/redoc/': 'redoc.html',
+}
+
+SERVER_TIMING_LOG = os.getenv('SERVER_TIMING_LOG', '') == '1'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api_yamdb.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Письма уходят из фонового потока, чтобы signup не ждал почтовый сервер.
+EMAIL_BACKEND = 'api_yamdb.mail.BackgroundEmailBackend'
+
+BACKGROUND_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+BACKGROUND_EMAIL_BATCH_SIZE = 50
+
+BACKGROUND_EMAIL_RETRIES = 3
+
+BACKGROUND_EMAIL_RETRY_DELAY = 1
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
-CSV_FILES_DIR = os.path.join(BASE_DIR, 'static\\data')
+CSV_FILES_DIR = os.path.join(BASE_DIR, 'static', 'data')
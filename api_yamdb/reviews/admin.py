@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User, Category, Comment, Review, Title
+from .models import User, Category, Comment, Review, Title, TitleGenre
 
 
 class ReviewAdmin(admin.ModelAdmin):
@@ -15,8 +15,18 @@ class CommentAdmin(admin.ModelAdmin):
     list_filter = ('pub_date', 'author', )
 
 
+class TitleGenreInline(admin.TabularInline):
+    model = TitleGenre
+    extra = 1
+
+
+class TitleAdmin(admin.ModelAdmin):
+    # Жанры со своей моделью связи редактируются только через inline.
+    inlines = (TitleGenreInline, )
+
+
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Category)
 admin.site.register(User)
-admin.site.register(Title)
+admin.site.register(Title, TitleAdmin)
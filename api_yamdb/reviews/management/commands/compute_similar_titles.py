@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews import similarity
+
+
+class Command(BaseCommand):
+    help = 'Compute the similar titles neighbor table (requires numpy)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--neighbors',
+            type=int,
+            help='Сколько похожих произведений хранить для каждого'
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            help='Сколько строк матрицы сходства считать за раз'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if similarity.np is None:
+            raise CommandError(
+                'Для расчёта похожих произведений установите numpy'
+            )
+        total = similarity.compute_similar_titles(
+            neighbors=options['neighbors'],
+            block_size=options['block_size'],
+            batch_size=options['batch_size'],
+        )
+        print(f'Похожие произведения рассчитаны, записей: {total}')
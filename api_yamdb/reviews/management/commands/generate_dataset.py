@@ -0,0 +1,220 @@
+import csv
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.management.commands.load_csv_files import (
+    FIELDS,
+    FILE_NAMES_CLASSES,
+    LOAD_ERRORS,
+    bulk_load,
+    reset_sequences,
+)
+from reviews.ratings import recompute_ratings
+
+DEFAULT_ANCHOR = datetime(2020, 1, 1, tzinfo=timezone.utc)
+HEADERS = {
+    'users.csv': ('id', 'username', 'email', 'role', 'bio', 'first_name',
+                  'last_name'),
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+WORDS = (
+    'фильм', 'книга', 'сюжет', 'герой', 'финал', 'музыка', 'актёр', 'автор',
+    'смысл', 'сцена', 'диалог', 'стиль', 'жанр', 'история', 'мир', 'образ',
+    'отличный', 'скучный', 'сильный', 'слабый', 'неожиданный', 'красивый',
+    'затянутый', 'яркий', 'мрачный', 'смешной', 'честный', 'странный',
+)
+TEXT_POOL_SIZE = 1000
+CATEGORIES = 8
+GENRES = 24
+# Показатель степенного закона популярности: несколько «горячих»
+# произведений собирают большую часть отзывов, хвост почти пуст.
+POPULARITY_EXPONENT = 1.1
+HISTORY_DAYS = 365
+
+
+class DatasetGenerator:
+    """Детерминированно порождает строки всех таблиц для заданного масштаба.
+
+    Все строки — кортежи в порядке HEADERS, совместимые с load_csv_files.
+    """
+
+    def __init__(self, reviews, seed, anchor):
+        self.rng = random.Random(seed)
+        self.anchor = anchor
+        self.reviews = reviews
+        self.users = max(1000, reviews // 10)
+        self.titles = max(10, reviews // 25)
+        self.comments = reviews // 4
+        self.texts = [
+            ' '.join(self.rng.choices(WORDS, k=self.rng.randint(5, 30)))
+            .capitalize() + '.'
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.review_counts = self.allocate_reviews()
+        self.reviews = sum(self.review_counts)
+
+    def allocate_reviews(self):
+        weights = [
+            1 / (rank + 1) ** POPULARITY_EXPONENT
+            for rank in range(self.titles)
+        ]
+        total = sum(weights)
+        return [
+            min(self.users, int(self.reviews * weight / total))
+            for weight in weights
+        ]
+
+    def text(self):
+        return self.texts[self.rng.randrange(TEXT_POOL_SIZE)]
+
+    def pub_date(self):
+        # Свежих отзывов больше, чем старых.
+        seconds = HISTORY_DAYS * 86400 * self.rng.random() ** 2
+        return (self.anchor - timedelta(seconds=seconds)).isoformat()
+
+    def rows(self, file_name):
+        return getattr(self, 'generate_' + file_name.split('.')[0])()
+
+    def generate_users(self):
+        for pk in range(1, self.users + 1):
+            chance = self.rng.random()
+            role = (
+                'admin' if chance < 0.001
+                else 'moderator' if chance < 0.01
+                else 'user'
+            )
+            yield (pk, f'user{pk}', f'user{pk}@yamdb.fake', role, '', '', '')
+
+    def generate_category(self):
+        for pk in range(1, CATEGORIES + 1):
+            yield pk, f'Категория {pk}', f'category-{pk}'
+
+    def generate_genre(self):
+        for pk in range(1, GENRES + 1):
+            yield pk, f'Жанр {pk}', f'genre-{pk}'
+
+    def generate_titles(self):
+        categories = range(1, CATEGORIES + 1)
+        weights = [1 / pk for pk in categories]
+        for pk in range(1, self.titles + 1):
+            yield (
+                pk,
+                f'Произведение {pk}',
+                self.rng.randint(1900, self.anchor.year),
+                self.rng.choices(categories, weights)[0],
+            )
+
+    def generate_genre_title(self):
+        pk = 0
+        for title_id in range(1, self.titles + 1):
+            for genre_id in self.rng.sample(
+                range(1, GENRES + 1), self.rng.randint(1, 3)
+            ):
+                pk += 1
+                yield pk, title_id, genre_id
+
+    def generate_review(self):
+        pk = 0
+        for title_id, count in enumerate(self.review_counts, 1):
+            quality = self.rng.uniform(3, 9)
+            for author in self.rng.sample(range(1, self.users + 1), count):
+                pk += 1
+                score = min(10, max(1, round(self.rng.gauss(quality, 1.5))))
+                yield (
+                    pk, title_id, self.text(), author, score, self.pub_date()
+                )
+
+    def generate_comments(self):
+        if not self.reviews:
+            return
+        for pk in range(1, self.comments + 1):
+            # Отзывы горячих произведений идут первыми и получают
+            # большую часть комментариев.
+            review_id = int(self.reviews * self.rng.random() ** 3) + 1
+            yield (
+                pk, review_id, self.text(),
+                self.rng.randint(1, self.users), self.pub_date()
+            )
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=1000,
+            help='Масштаб: желаемое количество отзывов'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--anchor',
+            type=datetime.fromisoformat,
+            # Постоянная, а не текущая дата: один и тот же --seed даёт
+            # одинаковые данные в любой день.
+            default=DEFAULT_ANCHOR,
+            help='Дата самого свежего отзыва, по умолчанию 2020-01-01; '
+                 'для непустого trending укажите сегодняшнюю'
+        )
+        parser.add_argument(
+            '--output',
+            help='Каталог для csv-файлов; без него данные пишутся в БД'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        anchor = options['anchor']
+        if anchor.tzinfo is None:
+            anchor = anchor.replace(tzinfo=timezone.utc)
+        generator = DatasetGenerator(
+            options['reviews'], options['seed'], anchor
+        )
+        print(
+            f'Пользователей: {generator.users}, произведений: '
+            f'{generator.titles}, отзывов: {generator.reviews}, '
+            f'комментариев: {generator.comments}'
+        )
+        if options['output']:
+            self.write_csv(generator, options['output'])
+        else:
+            self.write_db(generator, options['batch_size'])
+
+    def write_csv(self, generator, directory):
+        os.makedirs(directory, exist_ok=True)
+        for file_name, header in HEADERS.items():
+            path = os.path.join(directory, file_name)
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                writer.writerows(generator.rows(file_name))
+            print(f'Записан файл {path}')
+
+    def write_db(self, generator, batch_size):
+        for file_name, header in HEADERS.items():
+            model = FILE_NAMES_CLASSES[file_name]
+            fields = [FIELDS.get(field, field) for field in header]
+            rows = (
+                dict(zip(fields, row)) for row in generator.rows(file_name)
+            )
+            try:
+                with transaction.atomic():
+                    total = bulk_load(model, rows, batch_size)
+            except LOAD_ERRORS as error:
+                raise CommandError(
+                    f'Ошибка при заполнении {model.__name__}: {error}. '
+                    'Генератор ожидает пустую базу данных.'
+                )
+            print(f'Модель {model.__name__} заполнена: {total}')
+        reset_sequences(list(FILE_NAMES_CLASSES.values()))
+        recompute_ratings()
+        print('Рейтинг произведений пересчитан')
@@ -1,7 +1,11 @@
 import csv
 import os
+from itertools import islice
 
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.db.utils import IntegrityError
 
 from api_yamdb.settings import CSV_FILES_DIR
@@ -11,9 +15,9 @@ from reviews.models import (
     Genre,
     Review,
     Title,
-    TitleGenre,
     User,
 )
+from reviews.ratings import recompute_ratings
 
 
 FILE_NAMES_CLASSES = {
@@ -21,54 +25,159 @@ FILE_NAMES_CLASSES = {
     'category.csv': Category,
     'genre.csv': Genre,
     'titles.csv': Title,
-    'genre_title.csv': TitleGenre,
+    'genre_title.csv': Title.genre.through,
     'review.csv': Review,
     'comments.csv': Comment,
 }
 FIELDS = {
-    'category': (Category, 'category'),
-    'genre_id': (Genre, 'genre'),
-    'title_id': (Title, 'title'),
-    'author': (User, 'author'),
-    'review_id': (Review, 'review'),
+    'category': 'category_id',
+    'genre_id': 'genre_id',
+    'title_id': 'title_id',
+    'author': 'author_id',
+    'review_id': 'review_id',
 }
+DEFAULT_BATCH_SIZE = 5000
+LOAD_ERRORS = (ValueError, TypeError, IntegrityError, ValidationError)
 
 
-def open_csv_file(file_name):
-    csv_path = os.path.join(CSV_FILES_DIR, file_name)
-    try:
-        with open(csv_path, encoding='utf-8') as file:
-            return tuple(csv.reader(file))
-    except FileNotFoundError:
-        print(f'Файл {file_name} не найден.')
+def open_csv_file(file_name, directory=CSV_FILES_DIR):
+    """Построчно читает csv-файл, переименовывая внешние ключи в *_id."""
+    csv_path = os.path.join(directory, file_name)
+    with open(csv_path, encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        fields = [FIELDS.get(field, field) for field in next(reader)]
+        foreign_keys = {
+            index for index, field in enumerate(fields)
+            if field in FIELDS.values()
+        }
+        for row in reader:
+            yield {
+                field: (
+                    None if index in foreign_keys and value == '' else value
+                )
+                for index, (field, value) in enumerate(zip(fields, row))
+            }
+
+
+class RowError(ValueError):
+    """Ошибка в конкретной строке файла."""
+
+    def __init__(self, number, data, error):
+        super().__init__(f'{error}\nНеверные данные в строке {number}: {data}')
+        self.number = number
+
+
+def insert_batch(model, objs):
+    """bulk_create с датами из файла вместо текущего времени.
+
+    bulk_create подставляет в поля auto_now_add текущее время, поэтому
+    даты из файла возвращаются одним bulk_update на пачку. Для этого у
+    строк должен быть id — в файлах и в generate_dataset он есть.
+    """
+    dates = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    saved = [
+        {name: getattr(obj, name) for name in dates} for obj in objs
+    ]
+    model.objects.bulk_create(objs)
+    if not dates:
+        return
+    restored = []
+    for obj, values in zip(objs, saved):
+        if obj.pk is None or None in values.values():
+            continue
+        for name, value in values.items():
+            setattr(obj, name, value)
+        restored.append(obj)
+    if restored:
+        model.objects.bulk_update(restored, dates)
 
 
-def get_object_data(fields, data):
-    object_data = dict(zip(fields, data))
-    for field in tuple(object_data.keys()):
-        if field in FIELDS:
-            new_field = FIELDS[field][1]
-            object_data[new_field] = object_data.pop(field)
-            object_data[new_field] = FIELDS[field][0].objects.get(
-                id=object_data[new_field]
-            )
-    return object_data
+def find_bad_row(model, rows, start):
+    """Номер, данные и ошибка первой строки пачки, которую нельзя вставить.
+
+    Строки вставляются по одной в точке сохранения, которая затем
+    откатывается.
+    """
+    with transaction.atomic():
+        try:
+            for number, data in enumerate(rows, start):
+                insert_batch(model, [model(**data)])
+        except LOAD_ERRORS as error:
+            transaction.set_rollback(True)
+            return number, data, error
+        transaction.set_rollback(True)
+    return None
+
+
+def bulk_load(model, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Вставляет строки пачками через bulk_create, возвращает их число.
+
+    При ошибке бросает RowError с номером первой неверной строки.
+    """
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        try:
+            with transaction.atomic():
+                insert_batch(model, [model(**data) for data in batch])
+        except LOAD_ERRORS as error:
+            bad_row = find_bad_row(model, batch, total + 1)
+            if bad_row is None:
+                raise
+            raise RowError(*bad_row) from error
+        total += len(batch)
+    return total
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
 
 
 class Command(BaseCommand):
     help = 'Load csv files to database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном INSERT'
+        )
+        parser.add_argument(
+            '--path',
+            default=CSV_FILES_DIR,
+            help='Каталог с csv-файлами'
+        )
+
     def handle(self, *args, **options):
+        loaded = []
         for file_name, class_ in FILE_NAMES_CLASSES.items():
             print(f'Заполнение модели {class_.__name__}')
-            fields, *data = open_csv_file(file_name)
             try:
-                for row in data:
-                    object_data = get_object_data(fields, row)
-                    class_.objects.create(**object_data)
-                print(f'Модель {class_.__name__} заполнена успешно')
-            except (ValueError, IntegrityError, TypeError) as error:
+                with transaction.atomic():
+                    total = bulk_load(
+                        class_,
+                        open_csv_file(file_name, options['path']),
+                        options['batch_size']
+                    )
+                loaded.append(class_)
                 print(
-                    f'Ошибка при заполнении {class_.__name__}: {error}.'
-                    f'\nНеверные данные: {row}.'
+                    f'Модель {class_.__name__} заполнена успешно: {total}'
                 )
+            except FileNotFoundError:
+                print(f'Файл {file_name} не найден.')
+            except LOAD_ERRORS as error:
+                print(f'Ошибка при заполнении {class_.__name__}: {error}.')
+        reset_sequences(loaded)
+        if Review in loaded:
+            recompute_ratings()
+            print('Рейтинг произведений пересчитан')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.rankings import rebuild_rankings
+
+
+class Command(BaseCommand):
+    help = 'Rebuild top and trending title rankings'
+
+    def handle(self, *args, **options):
+        total = rebuild_rankings()
+        print(f'Рейтинги пересобраны, позиций: {total}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from reviews import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for titles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        with transaction.atomic(using=connection.alias):
+            search.rebuild(connection)
+        print('Поисковый индекс произведений перестроен')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_generation_on_commit
+from reviews.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored title ratings from reviews'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recompute_ratings()
+            # UPDATE не отправляет сигналов: закэшированные списки
+            # произведений сбрасываются вручную.
+            bump_generation_on_commit('title')
+        print(f'Пересчитан рейтинг произведений: {updated}')
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+# SQL намеренно повторяет reviews.search, а не импортирует его: миграция
+# должна создавать ту же схему, что и в момент её написания.
+SQLITE_SETUP = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ai
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ad
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reviews_title_fts_au
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+)
+SQLITE_TEARDOWN = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ai',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_au',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+POSTGRESQL_SETUP = (
+    "CREATE INDEX IF NOT EXISTS reviews_title_search_idx ON reviews_title "
+    "USING GIN ((to_tsvector('simple', coalesce(name, '') || ' ' "
+    "|| coalesce(description, ''))))",
+)
+POSTGRESQL_TEARDOWN = ('DROP INDEX IF EXISTS reviews_title_search_idx',)
+
+SETUP = {'sqlite': SQLITE_SETUP, 'postgresql': POSTGRESQL_SETUP}
+TEARDOWN = {'sqlite': SQLITE_TEARDOWN, 'postgresql': POSTGRESQL_TEARDOWN}
+
+
+def install_search_index(apps, schema_editor):
+    for statement in SETUP.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(apps, schema_editor):
+    for statement in TEARDOWN.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_review_comment_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
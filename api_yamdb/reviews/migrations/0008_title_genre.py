@@ -0,0 +1,50 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    """Явная модель связи Title.genre с индексом в Meta.indexes.
+
+    Таблица reviews_title_genre уже существует, поэтому модель заводится
+    только в состоянии миграций, а индекс из 0005 пересоздаётся под
+    именем из Meta.indexes.
+    """
+
+    dependencies = [
+        ('reviews', '0007_similar_title'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TitleGenre',
+                    fields=[
+                        ('id', models.AutoField(primary_key=True, serialize=False)),
+                        ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.genre', verbose_name='Жанр')),
+                        ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.title', verbose_name='Произведение')),
+                    ],
+                    options={
+                        'verbose_name': 'Жанр произведения',
+                        'verbose_name_plural': 'Жанры произведений',
+                        'db_table': 'reviews_title_genre',
+                        'unique_together': {('title', 'genre')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(null=True, related_name='titles', through='reviews.TitleGenre', to='reviews.Genre', verbose_name='Slug жанра'),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            'DROP INDEX reviews_title_genre_genre_title_idx',
+            'CREATE INDEX reviews_title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+        ),
+        migrations.AddIndex(
+            model_name='titlegenre',
+            index=models.Index(fields=('genre', 'title'), name='title_genre_genre_title_idx'),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core import validators
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from api.constants import CONFIRMATION_CODE_LENGTH
 
@@ -101,19 +101,131 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre,
+        through='TitleGenre',
         verbose_name='Slug жанра',
         related_name='titles',
         null=True
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    score_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=('year',), name='title_year_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class TitleGenre(models.Model):
+    """Связь произведения с жанром."""
+    # Столбец остался от автоматической таблицы из 0001: integer, а не
+    # BigAutoField из default_auto_field приложения.
+    id = models.AutoField(primary_key=True)
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE
+    )
+    genre = models.ForeignKey(
+        Genre,
+        verbose_name='Жанр',
+        on_delete=models.CASCADE
+    )
+
+    class Meta:
+        # Таблица раньше создавалась Django автоматически для Title.genre.
+        db_table = 'reviews_title_genre'
+        verbose_name = 'Жанр произведения'
+        verbose_name_plural = 'Жанры произведений'
+        unique_together = ('title', 'genre')
+        indexes = [
+            # Поиск произведений по жанру, см. TitleFilter.
+            models.Index(
+                fields=('genre', 'title'), name='title_genre_genre_title_idx'
+            ),
+        ]
+
+
+class TitleRanking(models.Model):
+    """Позиция произведения в заранее рассчитанном рейтинге.
+
+    board — имя рейтинга: top, top:category:<id>, top:genre:<id>
+    или trending.
+    """
+    board = models.CharField('Рейтинг', max_length=64)
+    position = models.PositiveIntegerField('Позиция')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='rankings',
+        verbose_name='Произведение'
+    )
+    score = models.FloatField('Взвешенная оценка')
+    review_count = models.PositiveIntegerField('Количество оценок')
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтингах'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('board', 'position'),
+                name='unique_ranking_position'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.board} #{self.position}: {self.title_id}'
+
+
+class SimilarTitle(models.Model):
+    """Сосед произведения, рассчитанный compute_similar_titles."""
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='neighbors',
+        verbose_name='Произведение'
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_for',
+        verbose_name='Похожее произведение'
+    )
+    position = models.PositiveSmallIntegerField('Позиция')
+    score = models.FloatField('Сходство')
+
+    class Meta:
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'position'),
+                name='unique_similar_position'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id} #{self.position}: {self.similar_id}'
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -140,6 +252,11 @@ class Review(models.Model):
     def __str__(self):
         return f'Комментарий {self.author.username} на {self.title.name}'
 
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется в post_save той же транзакцией.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -150,6 +267,12 @@ class Review(models.Model):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            )
+        ]
 
 
 class Comment(models.Model):
@@ -177,6 +300,12 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return f'Оценка {self.author.username} на {self.review.title.name}'
@@ -0,0 +1,124 @@
+"""Заранее рассчитанные рейтинги произведений.
+
+Произведения упорядочиваются по байесовской оценке
+(C * m + сумма оценок) / (C + количество оценок), где m — средняя
+оценка по всем отзывам, а C — RANKING_PRIOR_WEIGHT. Произведение с
+парой отзывов почти не отходит от m и не обгоняет проверенные
+многими зрителями.
+"""
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import Review, Title, TitleRanking
+
+TOP = 'top'
+TRENDING = 'trending'
+
+
+def category_board(category_id):
+    return f'top:category:{category_id}'
+
+
+def genre_board(genre_id):
+    return f'top:genre:{genre_id}'
+
+
+def bayesian_score(score_sum, score_count, mean, prior_weight):
+    return (prior_weight * mean + score_sum) / (prior_weight + score_count)
+
+
+def mean_score(stats):
+    total_count = sum(count for _, count in stats.values())
+    if not total_count:
+        return None
+    return sum(score_sum for score_sum, _ in stats.values()) / total_count
+
+
+def rank(stats, mean, title_ids=None):
+    """Лучшие RANKING_SIZE произведений: [(title_id, score, count)].
+
+    stats — {title_id: (сумма оценок, количество оценок)}.
+    """
+    if title_ids is None:
+        title_ids = stats
+    prior_weight = settings.RANKING_PRIOR_WEIGHT
+    scored = (
+        (
+            bayesian_score(*stats[title_id], mean, prior_weight),
+            stats[title_id][1],
+            title_id,
+        )
+        for title_id in title_ids
+        if title_id in stats
+    )
+    best = heapq.nsmallest(
+        settings.RANKING_SIZE,
+        scored,
+        key=lambda item: (-item[0], -item[1], item[2])
+    )
+    return [(title_id, score, count) for score, count, title_id in best]
+
+
+def build_boards(now=None):
+    """Все рейтинги: {board: [(title_id, score, count)]}."""
+    now = now or timezone.now()
+    titles = Title.objects.filter(score_count__gt=0).values_list(
+        'id', 'category_id', 'score_sum', 'score_count'
+    )
+    stats = {}
+    by_category = defaultdict(list)
+    for title_id, category_id, score_sum, score_count in titles.iterator():
+        stats[title_id] = (score_sum, score_count)
+        if category_id is not None:
+            by_category[category_id].append(title_id)
+    by_genre = defaultdict(list)
+    links = Title.genre.through.objects.filter(
+        title_id__in=Title.objects.filter(score_count__gt=0).values('id')
+    ).values_list('genre_id', 'title_id')
+    for genre_id, title_id in links.iterator():
+        by_genre[genre_id].append(title_id)
+
+    recent = Review.objects.filter(
+        pub_date__gte=now - timedelta(days=settings.TRENDING_DAYS)
+    ).values('title_id').annotate(
+        total=Sum('score'), count=Count('id')
+    ).order_by().values_list('title_id', 'total', 'count')
+
+    recent_stats = {
+        title_id: (total, count) for title_id, total, count in recent
+    }
+    mean = mean_score(stats)
+    boards = {
+        TOP: rank(stats, mean),
+        TRENDING: rank(recent_stats, mean_score(recent_stats)),
+    }
+    for category_id, title_ids in by_category.items():
+        boards[category_board(category_id)] = rank(stats, mean, title_ids)
+    for genre_id, title_ids in by_genre.items():
+        boards[genre_board(genre_id)] = rank(stats, mean, title_ids)
+    return boards
+
+
+def rebuild_rankings(now=None, batch_size=5000):
+    """Пересобирает таблицу рейтингов и возвращает число строк."""
+    rows = [
+        TitleRanking(
+            board=board,
+            position=position,
+            title_id=title_id,
+            score=score,
+            review_count=count,
+        )
+        for board, ranking in build_boards(now).items()
+        for position, (title_id, score, count) in enumerate(ranking, 1)
+    ]
+    with transaction.atomic():
+        TitleRanking.objects.all().delete()
+        TitleRanking.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
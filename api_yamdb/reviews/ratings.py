@@ -0,0 +1,61 @@
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+
+from .models import Review, Title
+
+
+def shift_rating(title_id, score_delta, count_delta):
+    """Сдвигает сумму и количество оценок произведения одним UPDATE."""
+    new_sum = F('score_sum') + score_delta
+    new_count = F('score_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=new_sum,
+        score_count=new_count,
+        rating=Case(
+            When(score_count=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        ),
+    )
+
+
+def recompute_ratings(queryset=None):
+    """Пересчитывает рейтинги произведений по таблице отзывов."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    score_sum = Coalesce(
+        Subquery(
+            reviews.annotate(total=Sum('score')).values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+    score_count = Coalesce(
+        Subquery(
+            reviews.annotate(total=Count('pk')).values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+    queryset.update(score_sum=score_sum, score_count=score_count)
+    return queryset.update(
+        rating=Case(
+            When(score_count=0, then=Value(None)),
+            default=Cast(F('score_sum'), FloatField()) / F('score_count'),
+            output_field=FloatField(),
+        )
+    )
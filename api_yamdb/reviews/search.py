@@ -0,0 +1,163 @@
+"""Полнотекстовый поиск по названию и описанию произведений.
+
+В SQLite используется внешняя таблица FTS5, которую синхронизируют
+триггеры на reviews_title, поэтому индекс не отстаёт и при bulk_create.
+В PostgreSQL поиск идёт по GIN-индексу на to_tsvector.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Func, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reviews_title_fts'
+PG_INDEX = 'reviews_title_search_idx'
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce({name}, '') || ' ' "
+    "|| coalesce({description}, ''))"
+)
+# Совпадение в названии весит больше, чем в описании.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+SQLITE_SETUP = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+SQLITE_TEARDOWN = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def install(connection):
+    """Создаёт поисковый индекс, если его ещё нет."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for statement in SQLITE_SETUP:
+                cursor.execute(statement)
+        elif connection.vendor == 'postgresql':
+            document = PG_DOCUMENT.format(
+                name='name', description='description'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {PG_INDEX} ON reviews_title '
+                f'USING GIN (({document}))'
+            )
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for statement in SQLITE_TEARDOWN:
+                cursor.execute(statement)
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+def rebuild(connection):
+    """Пересоздаёт поисковый индекс по текущему содержимому таблицы."""
+    install(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'REINDEX INDEX {PG_INDEX}')
+
+
+class TitleSQL(Func):
+    """Фрагмент SQL с колонками {pk}, {name} и {description} произведения.
+
+    В отличие от RawSQL с именем таблицы колонки компилирует ORM, поэтому
+    фрагмент остаётся верным и во вложенном запросе с псевдонимом U0.
+    """
+
+    columns = ('pk', 'name', 'description')
+
+    def __init__(self, sql, params, output_field):
+        super().__init__(
+            *(F(column) for column in self.columns), output_field=output_field
+        )
+        self.sql = sql
+        self.params = params
+
+    def as_sql(self, compiler, connection, **extra_context):
+        columns = {}
+        for column, expression in zip(
+            self.columns, self.get_source_expressions()
+        ):
+            columns[column], _ = compiler.compile(expression)
+        return self.sql.format(**columns), list(self.params)
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query or '')
+
+
+def search_titles(queryset, query):
+    """Отбирает произведения по запросу и сортирует их по релевантности."""
+    terms = get_terms(query)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        rank = TitleSQL(
+            f'(SELECT bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {{pk}})',
+            (NAME_WEIGHT, DESCRIPTION_WEIGHT, match),
+            output_field=FloatField()
+        )
+        return queryset.filter(
+            id__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                (match,)
+            )
+        ).annotate(search_rank=rank).order_by('search_rank', 'id')
+    if vendor == 'postgresql':
+        match = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            TitleSQL(
+                PG_DOCUMENT + " @@ to_tsquery('simple', %s)",
+                (match,),
+                output_field=BooleanField()
+            )
+        ).annotate(
+            search_rank=TitleSQL(
+                "ts_rank(setweight(to_tsvector('simple', "
+                "coalesce({name}, '')), 'A') "
+                "|| setweight(to_tsvector('simple', "
+                "coalesce({description}, '')), 'D'), "
+                "to_tsquery('simple', %s))",
+                (match,),
+                output_field=FloatField()
+            )
+        ).order_by(F('search_rank').desc(), 'id')
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition)
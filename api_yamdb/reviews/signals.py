@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Review
+from .ratings import shift_rating
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Запоминает прежнюю оценку и произведение изменяемого отзыва."""
+    instance._previous_score = None
+    if instance.pk is None:
+        return
+    instance._previous_score = Review.objects.filter(
+        pk=instance.pk
+    ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_score', None)
+    if created or previous is None:
+        shift_rating(instance.title_id, instance.score, 1)
+        return
+    previous_title_id, previous_score = previous
+    if previous_title_id != instance.title_id:
+        shift_rating(previous_title_id, -previous_score, -1)
+        shift_rating(instance.title_id, instance.score, 1)
+    elif previous_score != instance.score:
+        shift_rating(instance.title_id, instance.score - previous_score, 0)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    shift_rating(instance.title_id, -instance.score, -1)
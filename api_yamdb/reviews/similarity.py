@@ -0,0 +1,201 @@
+"""Похожие произведения по совместным отзывам, жанрам и категории.
+
+Сходство двух произведений — взвешенная по SIMILARITY_WEIGHTS сумма
+трёх косинусов:
+- review: оценки авторов, оценивших оба произведения, за вычетом
+  средней оценки каждого автора;
+- genre: наборы жанров;
+- category: совпадение категории.
+
+Каждый признак хранится как разреженная матрица «признак × произведение»
+в двух представлениях, по признакам (CSR) и по произведениям (CSC).
+Матрица сходства считается блоками строк: для блока перемножаются только
+пары ненулевых элементов с общим признаком, так что плотной бывает лишь
+полоса блок × все произведения.
+"""
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Review, SimilarTitle, Title
+
+# Сколько ячеек плотной полосы сходства считается за один блок.
+BLOCK_CELLS = 4_000_000
+# Меньшее сходство — шум округления, а не общие признаки.
+MIN_SIMILARITY = 1e-9
+
+
+def fetch_pairs(queryset, fields, dtype):
+    """Столбцы values_list в виде массивов NumPy без списка кортежей."""
+    flat = np.fromiter(
+        chain.from_iterable(queryset.values_list(*fields).iterator()),
+        dtype=dtype
+    )
+    return flat.reshape(-1, len(fields)).T
+
+
+class Incidence:
+    """Разреженная матрица признак × произведение."""
+
+    def __init__(self, features, titles, values, title_count):
+        self.title_count = title_count
+        feature_count = int(features.max()) + 1 if len(features) else 0
+
+        by_feature = np.argsort(features, kind='stable')
+        self.feature_indptr = np.concatenate(([0], np.cumsum(
+            np.bincount(features, minlength=feature_count)
+        )))
+        self.feature_titles = titles[by_feature]
+        self.feature_values = values[by_feature]
+
+        by_title = np.argsort(titles, kind='stable')
+        self.title_indptr = np.concatenate(([0], np.cumsum(
+            np.bincount(titles, minlength=title_count)
+        )))
+        self.title_features = features[by_title]
+        self.title_values = values[by_title]
+
+        self.norms = np.sqrt(np.bincount(
+            titles, weights=values ** 2, minlength=title_count
+        ))
+
+    def block_product(self, start, stop):
+        """Скалярные произведения строк start:stop со всеми строками."""
+        rows = stop - start
+        begin, end = self.title_indptr[start], self.title_indptr[stop]
+        features = self.title_features[begin:end]
+        values = self.title_values[begin:end]
+        local = np.repeat(
+            np.arange(rows), np.diff(self.title_indptr[start:stop + 1])
+        )
+        counts = (
+            self.feature_indptr[features + 1] - self.feature_indptr[features]
+        )
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        partners = np.repeat(self.feature_indptr[features], counts) + offsets
+        return np.bincount(
+            np.repeat(local, counts) * self.title_count
+            + self.feature_titles[partners],
+            weights=np.repeat(values, counts) * self.feature_values[partners],
+            minlength=rows * self.title_count,
+        ).astype(np.float64, copy=False).reshape(rows, self.title_count)
+
+    def block_cosine(self, start, stop):
+        product = self.block_product(start, stop)
+        norms = np.outer(self.norms[start:stop], self.norms)
+        return np.divide(
+            product, norms, out=np.zeros_like(product), where=norms > 0
+        )
+
+
+def load_incidences(title_ids):
+    """Матрицы признаков по текущим данным: {название: Incidence}."""
+    title_count = len(title_ids)
+
+    authors, titles, scores = fetch_pairs(
+        Review.objects.all(), ('author_id', 'title_id', 'score'), np.int64
+    )
+    _, authors = np.unique(authors, return_inverse=True)
+    scores = scores.astype(np.float64)
+    author_means = (
+        np.bincount(authors, weights=scores)
+        / np.maximum(np.bincount(authors), 1)
+    )
+
+    genres, genre_titles = fetch_pairs(
+        Title.genre.through.objects.all(), ('genre_id', 'title_id'), np.int64
+    )
+    _, genres = np.unique(genres, return_inverse=True)
+
+    categories, category_titles = fetch_pairs(
+        Title.objects.filter(category__isnull=False),
+        ('category_id', 'id'),
+        np.int64,
+    )
+    _, categories = np.unique(categories, return_inverse=True)
+
+    def index(ids):
+        return np.searchsorted(title_ids, ids)
+
+    return {
+        'review': Incidence(
+            authors, index(titles), scores - author_means[authors],
+            title_count
+        ),
+        'genre': Incidence(
+            genres, index(genre_titles), np.ones(len(genres)), title_count
+        ),
+        'category': Incidence(
+            categories, index(category_titles), np.ones(len(categories)),
+            title_count
+        ),
+    }
+
+
+def iter_neighbors(neighbors, block_size=None):
+    """(title_id, similar_id, позиция, сходство) для всех произведений."""
+    title_ids = np.fromiter(
+        Title.objects.order_by('id').values_list('id', flat=True).iterator(),
+        dtype=np.int64
+    )
+    title_count = len(title_ids)
+    if title_count < 2:
+        return
+    incidences = load_incidences(title_ids)
+    weights = settings.SIMILARITY_WEIGHTS
+    neighbors = min(neighbors, title_count - 1)
+    block_size = block_size or max(1, BLOCK_CELLS // title_count)
+    for start in range(0, title_count, block_size):
+        stop = min(start + block_size, title_count)
+        similarity = sum(
+            weight * incidences[name].block_cosine(start, stop)
+            for name, weight in weights.items()
+        )
+        rows = np.arange(stop - start)
+        similarity[rows, rows + start] = -np.inf
+        # Устойчивая сортировка: при равном сходстве выше меньший id.
+        best = np.argsort(-similarity, axis=1, kind='stable')[:, :neighbors]
+        scores = np.take_along_axis(similarity, best, axis=1)
+        for row, (columns, values) in enumerate(zip(best, scores)):
+            title_id = int(title_ids[start + row])
+            position = 0
+            for column, score in zip(columns, values):
+                if score <= MIN_SIMILARITY:
+                    break
+                position += 1
+                yield title_id, int(title_ids[column]), position, float(score)
+
+
+def compute_similar_titles(neighbors=None, block_size=None, batch_size=5000):
+    """Пересобирает таблицу похожих произведений, возвращает число строк."""
+    if np is None:
+        raise ImportError('Для расчёта похожих произведений нужен numpy')
+    neighbors = neighbors or settings.SIMILAR_TITLES_COUNT
+    total = 0
+    with transaction.atomic():
+        SimilarTitle.objects.all().delete()
+        batch = []
+        for title_id, similar_id, position, score in iter_neighbors(
+            neighbors, block_size
+        ):
+            batch.append(SimilarTitle(
+                title_id=title_id,
+                similar_id=similar_id,
+                position=position,
+                score=score,
+            ))
+            if len(batch) >= batch_size:
+                SimilarTitle.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SimilarTitle.objects.bulk_create(batch)
+        total += len(batch)
+    return total
@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 
@@ -32,4 +33,14 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_cache',
 ]
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Выводит отчёты нагрузочных тестов, сохранённые в record_property."""
+    for report in terminalreporter.stats.get('passed', []):
+        for name, value in report.user_properties:
+            if name == 'benchmark':
+                terminalreporter.write_sep('-', report.nodeid)
+                terminalreporter.write_line(json.dumps(value, indent=2))
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        return client.get(f'/api/v1/titles/{title_id}/').json()['rating']
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        create_single_review(user_client, title_id, 'first', 10)
+        review = create_single_review(moderator_client, title_id, 'second', 4)
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        review_id = review.json()['id']
+        moderator_client.patch(f'{url}{review_id}/', data={'score': 2})
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        moderator_client.delete(f'{url}{review_id}/')
+        assert self.get_rating(admin_client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_recompute_ratings(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 8)
+        Title.objects.update(score_sum=0, score_count=0, rating=None)
+        # Список с устаревшим рейтингом попадает в кэш ответов.
+        admin_client.get('/api/v1/titles/')
+
+        call_command('recompute_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.score_count, title.rating) == (
+            8, 1, 8
+        ), (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'рейтинг произведений.'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+        ratings = {
+            title['id']: title['rating']
+            for title in admin_client.get('/api/v1/titles/').json()['results']
+        }
+        assert ratings[title_id] == 8, (
+            'Проверьте, что `recompute_ratings` сбрасывает кэш списка '
+            'произведений.'
+        )
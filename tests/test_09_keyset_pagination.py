@@ -0,0 +1,84 @@
+import base64
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09KeysetPagination:
+
+    def walk(self, client, url, link_key):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+                'статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не выполняет подсчёт '
+                'количества объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data[link_key]
+        return ids
+
+    def test_01_reviews_and_comments_cursor(self, admin_client, admin,
+                                            user_client, user,
+                                            moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+
+        for url, objects in ((reviews_url, reviews),
+                             (comments_url, comments)):
+            expected = [obj['id'] for obj in objects]
+            forward = self.walk(
+                admin_client, f'{url}?pagination=cursor&limit=1', 'next'
+            )
+            assert forward == expected, (
+                f'Проверьте, что курсорная пагинация `{url}` возвращает все '
+                'объекты в порядке публикации.'
+            )
+
+            last_page = admin_client.get(
+                f'{url}?pagination=cursor&limit=2'
+            ).json()
+            last_page = admin_client.get(last_page['next']).json()
+            backward = self.walk(admin_client, last_page['previous'],
+                                 'previous')
+            assert backward == expected[:2], (
+                f'Проверьте, что ссылка `previous` курсорной пагинации '
+                f'`{url}` возвращает предыдущую страницу.'
+            )
+
+    def test_02_invalid_cursor(self, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=broken'
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с некорректным курсором возвращает ответ '
+            'со статусом 404.'
+        )
+        for raw in (
+            'n|2020-01-01T00:00:00+00:00|99999999999999999999999',
+            'n|2020-01-01T00:00:00+00:00|-1',
+            'n|2020-01-01T00:00:00|1',
+            'x|2020-01-01T00:00:00+00:00|1',
+        ):
+            cursor = base64.urlsafe_b64encode(raw.encode()).decode()
+            url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor={cursor}'
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что курсор `{raw}` отклоняется со статусом 404.'
+            )
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Title
+from reviews.search import FTS_TABLE, search_titles
+from tests.utils import create_titles
+
+
+def fts_rowids(term):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [term]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleSearch:
+
+    def search(self, client, query):
+        response = client.get(f'/api/v1/titles/?search={query}')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?search=` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+
+        assert self.search(client, 'терминат') == [terminator], (
+            'Проверьте, что поиск находит произведение по началу слова '
+            'в названии.'
+        )
+        assert self.search(client, 'yippie') == [die_hard], (
+            'Проверьте, что поиск находит произведение по описанию.'
+        )
+        assert sorted(self.search(client, '!!!')) == sorted(
+            [terminator, die_hard]
+        ), 'Проверьте, что пустой поисковый запрос не фильтрует список.'
+
+    def test_02_search_ranking_and_sync(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        admin_client.patch(
+            f'/api/v1/titles/{die_hard}/',
+            data={'description': 'Почти как терминатор'}
+        )
+        assert self.search(client, 'терминатор') == [terminator, die_hard], (
+            'Проверьте, что совпадение в названии ранжируется выше '
+            'совпадения в описании и что индекс обновляется при изменении.'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{terminator}/')
+        assert self.search(client, 'терминатор') == [die_hard], (
+            'Проверьте, что удалённое произведение пропадает из поиска.'
+        )
+        if connection.vendor == 'sqlite':
+            assert fts_rowids('терминатор') == [die_hard], (
+                'Проверьте, что триггер удаляет произведение из индекса FTS5.'
+            )
+
+    def test_03_search_in_subquery(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        admin_client.patch(
+            f'/api/v1/titles/{die_hard}/',
+            data={'description': 'Почти как терминатор'}
+        )
+        best = search_titles(Title.objects.all(), 'терминатор')
+        assert list(Title.objects.filter(
+            id__in=best.values('id')[:1]
+        ).values_list('id', flat=True)) == [terminator], (
+            'Проверьте, что поиск с ранжированием работает во вложенном '
+            'запросе.'
+        )
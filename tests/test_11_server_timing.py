@@ -0,0 +1,23 @@
+import re
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ServerTiming:
+
+    def test_01_server_timing_header(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', header)
+        assert match and int(match.group(1)) > 0, (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` с '
+            'числом SQL-запросов и временем работы с БД.'
+        )
+        assert re.search(r'total;dur=[\d.]+', header), (
+            'Проверьте, что заголовок `Server-Timing` содержит общее время '
+            'обработки запроса.'
+        )
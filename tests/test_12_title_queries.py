@@ -0,0 +1,32 @@
+import pytest
+
+from tests.utils import create_titles
+
+# Подсчёт количества, страница произведений с категориями и жанры.
+TITLES_LIST_QUERIES = 3
+# Произведение с категорией и его жанры.
+TITLES_DETAIL_QUERIES = 2
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleQueries:
+
+    def test_01_titles_list_query_budget(self, admin_client, client,
+                                         django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        for year in range(2000, 2004):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Фильм {year}',
+                'year': year,
+                'genre': ['horror', 'comedy', 'drama'],
+                'category': 'films',
+            })
+
+        with django_assert_num_queries(TITLES_LIST_QUERIES):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == 5, (
+            'Проверьте, что список произведений отдаётся постранично.'
+        )
+
+        with django_assert_num_queries(TITLES_DETAIL_QUERIES):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/')
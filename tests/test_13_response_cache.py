@@ -0,0 +1,132 @@
+import time
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+from api.cache import GENERATION_KEY, get_generations
+from reviews.models import Genre, SimilarTitle, TitleRanking
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    def check_cache(self, admin_client, user_client, client,
+                    django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/?year=1984&name=Тер')
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/?name=Тер&year=1984')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что кэшированный ответ `/api/v1/titles/` совпадает '
+            'с исходным.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'text', 6)
+        response = client.get('/api/v1/titles/?year=1984&name=Тер')
+        assert response.json()['results'][0]['rating'] == 6, (
+            'Проверьте, что кэш списка произведений сбрасывается при '
+            'изменении отзывов.'
+        )
+
+        client.get('/api/v1/categories/')
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что кэш списка категорий сбрасывается при '
+            'добавлении категории.'
+        )
+
+        admin_client.delete('/api/v1/genres/comedy/')
+        response = client.get('/api/v1/titles/?year=1984')
+        assert len(response.json()['results'][0]['genre']) == 1, (
+            'Проверьте, что кэш списка произведений сбрасывается при '
+            'удалении жанра.'
+        )
+
+    def test_01_locmem_cache(self, admin_client, user_client, client,
+                             django_assert_num_queries):
+        self.check_cache(
+            admin_client, user_client, client, django_assert_num_queries
+        )
+
+    def test_02_file_based_cache(self, admin_client, user_client, client,
+                                 django_assert_num_queries, settings,
+                                 tmp_path):
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        self.check_cache(
+            admin_client, user_client, client, django_assert_num_queries
+        )
+
+    @pytest.mark.django_db
+    def test_03_bump_on_commit(self, django_capture_on_commit_callbacks):
+        before = get_generations('genre', 'title')
+        with django_capture_on_commit_callbacks() as callbacks:
+            Genre.objects.create(name='Драма', slug='drama')
+        assert get_generations('genre', 'title') == before, (
+            'Проверьте, что поколение не сдвигается до фиксации транзакции.'
+        )
+        assert callbacks
+        for callback in callbacks:
+            callback()
+        genre, title = get_generations('genre', 'title')
+        assert genre != before[0] and title == before[1], (
+            'Проверьте, что поколение сдвигается после фиксации транзакции.'
+        )
+
+    def test_04_bump_after_atomic(self, admin_client):
+        create_titles(admin_client)
+        before, = get_generations('title')
+        with transaction.atomic():
+            Genre.objects.get(slug='drama').titles.clear()
+            assert get_generations('title') == [before]
+        assert get_generations('title') != [before]
+
+    @pytest.mark.django_db
+    def test_05_fast_delete(self, django_assert_num_queries):
+        for model in (TitleRanking, SimilarTitle):
+            assert not post_delete.has_listeners(model), (
+                'Проверьте, что обработчики кэша подключены только к моделям '
+                'каталога и не мешают быстрому удалению.'
+            )
+            with django_assert_num_queries(1):
+                model.objects.all().delete()
+
+    @pytest.mark.django_db
+    def test_06_object_generations_kept(self, settings, tmp_path,
+                                        monkeypatch):
+        settings.CACHES = {
+            'default': {
+                **django_settings.CACHES['default'],
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        first, = get_generations('review:title:1')
+        model, = get_generations('title')
+        for title_id in range(2, 400):
+            get_generations(f'review:title:{title_id}')
+        assert get_generations('review:title:1') == [first], (
+            'Проверьте, что лимит записей кэша (CACHE_MAX_ENTRIES) вмещает '
+            'поколения отдельных произведений и они не вытесняются.'
+        )
+
+        later = time.time() + settings.CACHE_OBJECT_GENERATION_TIMEOUT + 1
+        monkeypatch.setattr(time, 'time', lambda: later)
+        assert cache.get(GENERATION_KEY.format('review:title:1')) is None, (
+            'Проверьте, что поколения отдельных объектов живут '
+            'ограниченное время.'
+        )
+        assert get_generations('title') == [model]
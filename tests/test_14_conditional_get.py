@@ -0,0 +1,90 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_review
+
+
+def shift_clock(monkeypatch, seconds):
+    now = time.time_ns()
+    monkeypatch.setattr(time, 'time_ns', lambda: now + seconds * 10 ** 9)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    @pytest.fixture
+    def shared_cache(self, settings, tmp_path):
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+
+    @pytest.mark.usefixtures('shared_cache')
+    def test_01_reviews_etag(self, admin_client, admin, user_client, client,
+                             django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 без '
+            'обращения к БД.'
+        )
+
+        other_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        other_etag = client.get(other_url)['ETag']
+        create_single_review(user_client, titles[0]['id'], 'new', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва `ETag` списка отзывов '
+            'меняется.'
+        )
+        response = client.get(other_url, HTTP_IF_NONE_MATCH=other_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что отзыв к одному произведению не меняет `ETag` '
+            'отзывов к другому.'
+        )
+
+    @pytest.mark.usefixtures('shared_cache')
+    def test_02_titles_last_modified(self, admin_client, client,
+                                     monkeypatch):
+        reviews, titles = create_reviews(admin_client, {})
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert 'Last-Modified' not in client.get(url), (
+            'Проверьте, что `Last-Modified` не выдаётся, пока не истекла '
+            'секунда последнего изменения.'
+        )
+        shift_clock(monkeypatch, 2)
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с `If-Modified-Since` '
+            'возвращает ответ со статусом 304, если произведение не '
+            'менялось.'
+        )
+
+    def test_03_no_validators_with_local_cache(self, admin_client, client,
+                                               monkeypatch):
+        reviews, titles = create_reviews(admin_client, {})
+        shift_clock(monkeypatch, 2)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        assert 'ETag' not in response and 'Last-Modified' not in response, (
+            'Проверьте, что с кэшем в памяти процесса `ETag` и '
+            '`Last-Modified` не выдаются.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == HTTPStatus.OK
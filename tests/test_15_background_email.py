@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+
+from api_yamdb import mail as background_mail
+
+
+class FlakyEmailBackend(EmailBackend):
+    failures = 0
+
+    def send_messages(self, messages):
+        if FlakyEmailBackend.failures:
+            FlakyEmailBackend.failures -= 1
+            raise ConnectionError('SMTP недоступен')
+        return super().send_messages(messages)
+
+
+class PartialEmailBackend(EmailBackend):
+    """Как SMTP: сбой на втором письме после того, как первое ушло."""
+
+    failures = 0
+
+    def send_messages(self, messages):
+        sent = 0
+        for message in messages:
+            if message.to == ['second@yamdb.fake'] and (
+                PartialEmailBackend.failures
+            ):
+                PartialEmailBackend.failures -= 1
+                raise ConnectionError('SMTP недоступен')
+            sent += super().send_messages([message])
+        return sent
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15BackgroundEmail:
+
+    @pytest.fixture(autouse=True)
+    def background_backend(self, settings):
+        settings.EMAIL_BACKEND = 'api_yamdb.mail.BackgroundEmailBackend'
+        settings.BACKGROUND_EMAIL_BACKEND = (
+            'tests.test_15_background_email.FlakyEmailBackend'
+        )
+        settings.BACKGROUND_EMAIL_RETRY_DELAY = 0
+
+    def test_01_signup_sends_in_background(self, client):
+        FlakyEmailBackend.failures = 1
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': 'new@yamdb.fake',
+            'username': 'new_user',
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что POST-запрос к `/api/v1/auth/signup/` с '
+            'корректными данными возвращает ответ со статусом 200.'
+        )
+        background_mail.flush()
+        assert [message.to for message in mail.outbox] == [
+            ['new@yamdb.fake']
+        ], (
+            'Проверьте, что письмо с кодом подтверждения отправляется '
+            'в фоне и повторяется после ошибки.'
+        )
+
+    def test_02_retry_only_unsent(self, settings):
+        settings.BACKGROUND_EMAIL_BACKEND = (
+            'tests.test_15_background_email.PartialEmailBackend'
+        )
+        PartialEmailBackend.failures = 1
+        batch = [
+            EmailMessage('Код', 'text', to=[f'{name}@yamdb.fake'])
+            for name in ('first', 'second', 'third')
+        ]
+        connection = background_mail.MailWorker().deliver(None, batch)
+        connection.close()
+        assert [message.to for message in mail.outbox] == [
+            ['first@yamdb.fake'], ['second@yamdb.fake'], ['third@yamdb.fake']
+        ], (
+            'Проверьте, что после ошибки повторно отправляются только '
+            'неотправленные письма пачки.'
+        )
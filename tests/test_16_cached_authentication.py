@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16CachedAuthentication:
+
+    def test_01_reads_skip_users_table(self, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        auth_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_user"' in query['sql']
+        ]
+        assert not auth_queries, (
+            'Проверьте, что аутентифицированный запрос берёт пользователя '
+            'из кэша и не обращается к таблице пользователей.'
+        )
+
+    def test_02_cache_invalidated_on_save(self, admin_client, admin):
+        url = '/api/v1/users/'
+        assert admin_client.get(url).status_code == HTTPStatus.OK
+        admin.role = 'user'
+        admin.save()
+        assert admin_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что изменение роли пользователя сбрасывает его '
+            'закэшированные данные.'
+        )
+
+    def test_03_me_keeps_other_fields(self, user_client, user):
+        user_client.get('/api/v1/users/me/')
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'first_name': 'Имя'}
+        )
+        data = response.json()
+        assert (data['first_name'], data['bio'], data['email']) == (
+            'Имя', user.bio, user.email
+        ), (
+            'Проверьте, что PATCH-запрос к `/api/v1/users/me/` с '
+            'закэшированным пользователем не затирает остальные поля.'
+        )
+        user.refresh_from_db()
+        assert (user.first_name, user.bio) == ('Имя', 'user bio')
+
+    def test_04_me_single_query(self, user_client,
+                                django_assert_num_queries):
+        user_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(1):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/users/me/` читает '
+            'пользователя одним запросом, а не по запросу на поле.'
+        )
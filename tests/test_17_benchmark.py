@@ -0,0 +1,65 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from api.benchmark import run_benchmark
+from api.cache import GENERATION_KEY
+from reviews.models import Review, Title, User
+
+SCENARIOS = (
+    'titles_list', 'titles_filter', 'titles_filter_all_genres',
+    'titles_filter_icontains', 'title_detail', 'reviews_list',
+    'comments_list', 'comment_create', 'review_create', 'signup', 'token',
+)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+class Test17Benchmark:
+
+    @pytest.fixture
+    def dataset(self):
+        call_command('generate_dataset', reviews=2000, seed=1)
+
+    def test_01_all_scenarios(self, dataset, record_property):
+        report = run_benchmark(iterations=20, warmup=2)
+        # Отчёт выводится в итогах pytest (см. conftest) и в --junitxml.
+        record_property('benchmark', report['scenarios'])
+        assert tuple(report['scenarios']) == SCENARIOS, (
+            'Проверьте, что бенчмарк покрывает все сценарии API.'
+        )
+        for name, metrics in report['scenarios'].items():
+            assert metrics['errors'] == 0, (
+                f'Сценарий `{name}` вернул неожиданный статус ответа.'
+            )
+            assert metrics['p50_ms'] <= metrics['p95_ms'] <= metrics['p99_ms']
+
+    def test_02_cache_cleared(self, dataset, client):
+        client.get('/api/v1/titles/')
+        run_benchmark(
+            iterations=2, warmup=0, only=('review_create', 'titles_list')
+        )
+        assert cache.get(GENERATION_KEY.format('title')) is None, (
+            'Проверьте, что после прогона кэш очищается: поколения и ответы '
+            'построены по данным копии базы.'
+        )
+
+    def test_03_original_database_untouched(self, dataset):
+        counts = (User.objects.count(), Review.objects.count())
+        run_benchmark(
+            iterations=3, warmup=0, only=('review_create', 'signup')
+        )
+        assert (User.objects.count(), Review.objects.count()) == counts, (
+            'Проверьте, что сценарии записи фиксируются в копии базы, '
+            'а исходная база не меняется.'
+        )
+
+    def test_04_review_create_skipped(self, dataset):
+        titles = Title.objects.count()
+        report = run_benchmark(
+            iterations=titles, warmup=1, only=('review_create',)
+        )
+        assert report['scenarios'] == {}, (
+            'Проверьте, что review_create пропускается, когда свободных '
+            'произведений меньше, чем запросов.'
+        )
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.urls import resolve
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from reviews.models import Review, Title, User
+from tests.utils import explain, list_queryset
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Планы запросов проверяются для SQLite.'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18QueryPlans:
+
+    @pytest.fixture
+    def review(self):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        author = User.objects.create(username='author', email='a@yamdb.fake')
+        return Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+
+    @pytest.mark.parametrize('viewset, url, index', (
+        (
+            ReviewViewSet, '/api/v1/titles/{title}/reviews/',
+            'review_title_pub_date_idx',
+        ),
+        (
+            ReviewViewSet, '/api/v1/titles/{title}/reviews/?pagination=cursor',
+            'review_title_pub_date_idx',
+        ),
+        (
+            CommentViewSet, '/api/v1/titles/{title}/reviews/{review}/comments/',
+            'comment_review_pub_date_idx',
+        ),
+        (TitleViewSet, '/api/v1/titles/?year=1984', 'title_year_idx'),
+        (
+            TitleViewSet, '/api/v1/titles/?genre=horror',
+            'title_genre_genre_title_idx',
+        ),
+        (
+            TitleViewSet, '/api/v1/titles/?genre=horror,drama',
+            'title_genre_genre_title_idx',
+        ),
+        (
+            TitleViewSet, '/api/v1/titles/?category=films',
+            'reviews_title_category_id',
+        ),
+    ))
+    def test_01_index_used(self, review, viewset, url, index):
+        url = url.format(title=review.title_id, review=review.id)
+        kwargs = resolve(url.split('?')[0]).kwargs
+        plan = explain(list_queryset(viewset, url, **kwargs))
+        assert f'INDEX {index}' in plan, (
+            f'Проверьте, что запрос `{url}` использует индекс `{index}`. '
+            f'План запроса:\n{plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что сортировка `{url}` выполняется по индексу. '
+            f'План запроса:\n{plan}'
+        )
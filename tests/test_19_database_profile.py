@@ -0,0 +1,24 @@
+import pytest
+from django.db import connection
+
+from api_yamdb.db import apply_sqlite_pragmas
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Прагмы применяются к SQLite.'
+)
+@pytest.mark.django_db
+class Test19DatabaseProfile:
+
+    def test_01_pragmas_applied(self, settings):
+        settings.SQLITE_PRAGMAS = {'cache_size': -4096, 'busy_timeout': 1234}
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        with connection.cursor() as cursor:
+            values = [
+                cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                for name in ('cache_size', 'busy_timeout')
+            ]
+        assert values == [-4096, 1234], (
+            'Проверьте, что при создании соединения применяются прагмы '
+            'из настройки `SQLITE_PRAGMAS`.'
+        )
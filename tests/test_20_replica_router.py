@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+
+from api_yamdb.routers import PrimaryReplicaRouter, replica_reads
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture(scope='module')
+def replica(django_db_setup, django_db_blocker, tmp_path_factory):
+    """Реплика — отдельный файл SQLite со схемой основной базы."""
+    path = str(tmp_path_factory.mktemp('replica') / 'replica.sqlite3')
+    connections.databases['replica'] = {
+        **connections.databases['default'],
+        'NAME': path,
+        'TEST': {'NAME': path},
+    }
+    with django_db_blocker.unblock():
+        call_command('migrate', database='replica', verbosity=0)
+    yield 'replica'
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+class Test20ReplicaRouter:
+
+    def test_01_reads_go_to_replica_until_write(self, settings):
+        settings.DATABASE_REPLICAS = ['replica1']
+        router = PrimaryReplicaRouter()
+
+        assert router.db_for_read(Title) == 'default', (
+            'Проверьте, что вне запросов на чтение используется основная '
+            'база данных.'
+        )
+        with replica_reads():
+            assert router.db_for_read(Title) == 'replica1', (
+                'Проверьте, что безопасные запросы читают данные с реплики.'
+            )
+            assert router.db_for_write(Title) == 'default'
+            assert router.db_for_read(Title) == 'default', (
+                'Проверьте, что после записи чтение в том же запросе идёт '
+                'с основной базы данных.'
+            )
+        with replica_reads(enabled=False):
+            assert router.db_for_read(Title) == 'default', (
+                'Проверьте, что небезопасные запросы читают с основной базы.'
+            )
+
+    def test_02_no_replicas_configured(self, settings):
+        settings.DATABASE_REPLICAS = []
+        with replica_reads():
+            assert PrimaryReplicaRouter().db_for_read(Title) == 'default'
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Реплика в тестах — файл SQLite.'
+)
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class Test20ReplicaFiles:
+
+    @pytest.fixture(autouse=True)
+    def use_replica(self, replica, settings):
+        settings.DATABASE_REPLICAS = [replica]
+
+    def test_01_reads_replica_writes_primary(self, admin_client, client,
+                                             settings):
+        settings.REPLICA_MAX_LAG = 0
+        Title.objects.using('replica').create(name='С реплики', year=2000)
+        Category.objects.create(name='Фильмы', slug='films')
+        Genre.objects.create(name='Драма', slug='drama')
+
+        response = client.get('/api/v1/titles/')
+        assert [title['name'] for title in response.json()['results']] == [
+            'С реплики'
+        ], 'Проверьте, что безопасные запросы читают данные с реплики.'
+
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'category': 'films',
+            'genre': ['drama'],
+        })
+        assert response.status_code == 201, response.json()
+        assert response.json()['genre'] == ['drama'], (
+            'Проверьте, что запрос на запись читает с основной базы.'
+        )
+        assert Title.objects.using('default').filter(name='Чужой').exists()
+        assert not Title.objects.using('replica').filter(
+            name='Чужой'
+        ).exists(), 'Проверьте, что запись идёт в основную базу.'
+
+        with replica_reads():
+            assert not Title.objects.filter(name='Чужой').exists()
+            Genre.objects.create(name='Ужасы', slug='horror')
+            assert Title.objects.filter(name='Чужой').exists(), (
+                'Проверьте, что после записи чтение в том же запросе идёт '
+                'с основной базы.'
+            )
+
+    def test_02_primary_while_replica_may_lag(self, client, settings,
+                                               monkeypatch):
+        settings.REPLICA_MAX_LAG = 60
+        Title.objects.using('replica').create(name='С реплики', year=2000)
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что сразу после изменения данные читаются с '
+            'основной базы, а не с отстающей реплики.'
+        )
+        now = time.time_ns()
+        monkeypatch.setattr(time, 'time_ns', lambda: now + 61 * 10 ** 9)
+        response = client.get('/api/v1/titles/?year=2000')
+        assert response.json()['count'] == 1
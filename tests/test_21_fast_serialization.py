@@ -0,0 +1,77 @@
+import pytest
+from django.core.cache import cache
+
+from api.benchmark import measure_serialization
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21FastSerialization:
+
+    def get_both(self, client, url, settings):
+        responses = []
+        for enabled in (True, False):
+            settings.FAST_LIST_SERIALIZATION = enabled
+            cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200
+            responses.append(response.content)
+        return responses
+
+    def check_identical(self, client, url, settings):
+        fast, drf = self.get_both(client, url, settings)
+        assert fast == drf, (
+            f'Проверьте, что быстрый путь `{url}` отдаёт тот же JSON, '
+            'что и сериализаторы DRF.'
+        )
+
+    def test_01_identical_output(self, admin_client, client, settings,
+                                 user_client, moderator_client,
+                                 admin, user, moderator):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        create_single_review(user_client, titles[1]['id'], 'text', 7)
+        create_single_review(moderator_client, titles[1]['id'], 'text', 8)
+        # Произведения без категории и жанров, на вторую страницу.
+        for year in range(2000, 2004):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Фильм {year}', 'year': year, 'category': 'films',
+                'genre': ['horror'],
+            })
+        admin_client.delete('/api/v1/categories/films/')
+        admin_client.delete('/api/v1/genres/horror/')
+
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for url in (
+            '/api/v1/titles/',
+            '/api/v1/titles/?page=2',
+            '/api/v1/titles/?year=1984',
+            reviews_url,
+            f'{reviews_url}?limit=1&offset=1',
+            f'{reviews_url}?pagination=cursor&limit=1',
+            comments_url,
+            f'{comments_url}?pagination=cursor&limit=1',
+        ):
+            self.check_identical(client, url, settings)
+
+        settings.FAST_LIST_SERIALIZATION = True
+        next_url = client.get(
+            f'{reviews_url}?pagination=cursor&limit=1'
+        ).json()['next']
+        self.check_identical(client, next_url, settings)
+
+    def test_02_measure_serialization(self, admin_client, user_client,
+                                      moderator_client, user, moderator):
+        create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        report = measure_serialization(items=10, repeat=2)
+        assert set(report) == {'titles', 'reviews', 'comments'}, (
+            'Проверьте, что замер сериализации покрывает произведения, '
+            'отзывы и комментарии.'
+        )
+        for metrics in report.values():
+            assert metrics['drf_us_per_item'] > 0
+            assert metrics['fast_us_per_item'] > 0
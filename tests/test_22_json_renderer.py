@@ -0,0 +1,128 @@
+import io
+import json
+from collections import OrderedDict
+from enum import IntEnum
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from django.http import QueryDict
+from django.utils.functional import lazy
+from django.utils.safestring import mark_safe
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+lazy_str = lazy(str, str)
+
+
+class Score(IntEnum):
+    TEN = 10
+
+
+DATA = OrderedDict((
+    ('id', 1),
+    ('name', 'Терминатор\u2028«I`ll be back»\u2029'),
+    ('rating', 7.25),
+    ('price', Decimal('10.50')),
+    ('pub_date', datetime(2022, 1, 2, 3, 4, 5, 123456, timezone.utc)),
+    ('msk', datetime(
+        2022, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))
+    )),
+    ('naive', datetime(2022, 1, 2, 3, 4, 5)),
+    ('day', date(2022, 1, 2)),
+    ('time', time(3, 4, 5, 6)),
+    ('uuid', UUID('12345678123456781234567812345678')),
+    ('lazy', lazy_str('ленивая строка')),
+    ('huge', 2 ** 70),
+    ('empty', None),
+    ('genre', [{'name': 'Драма', 'slug': 'drama'}]),
+))
+
+
+class Test22JSONRenderer:
+
+    @pytest.mark.parametrize('data', [
+        DATA, [DATA, DATA], {1: 'int key'}, [], {}, 'text', None,
+        QueryDict('username=a&username=b&email=c'),
+        {'safe': mark_safe('<b>'), 'score': Score.TEN, 'flag': True},
+    ])
+    def test_01_same_output_as_drf(self, data):
+        expected = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == expected, (
+            'Проверьте, что FastJSONRenderer отдаёт тот же JSON, что и '
+            'JSONRenderer DRF.'
+        )
+
+    def test_02_floats(self):
+        data = {'values': [1e16, 1.5e-7, 0.1, 1e308, -2.5e-300]}
+        rendered = FastJSONRenderer().render(data)
+        assert json.loads(rendered) == json.loads(
+            JSONRenderer().render(data)
+        ), 'Проверьте, что числа с плавающей точкой не теряют значения.'
+        assert rendered.startswith(b'{"values":[1e16,1.5e-7,'), (
+            'Запись экспоненты у orjson короче, чем у стандартного json: '
+            'это задокументированное отличие.'
+        )
+        for value in (float('nan'), float('inf')):
+            with pytest.raises(ValueError):
+                JSONRenderer().render({'rating': value})
+            assert FastJSONRenderer().render({'rating': value}) == (
+                b'{"rating":null}'
+            )
+
+    def test_03_indent_and_fallback(self, monkeypatch):
+        for media_type in ('application/json; indent=4', None):
+            context = {'indent': 2} if media_type is None else {}
+            assert FastJSONRenderer().render(
+                DATA, media_type, context
+            ) == JSONRenderer().render(DATA, media_type, context)
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def check_parse(self, body, parser_context=None):
+        expected = JSONParser().parse(io.BytesIO(body), None, parser_context)
+        assert FastJSONParser().parse(
+            io.BytesIO(body), None, parser_context
+        ) == expected, (
+            'Проверьте, что FastJSONParser разбирает JSON так же, как '
+            'JSONParser DRF.'
+        )
+
+    def test_04_parser(self, monkeypatch):
+        self.check_parse('{"name": "Дюна", "year": 1965, "genre": []}'.encode())
+        self.check_parse(str(2 ** 70).encode())
+        self.check_parse(
+            '{"name": "Дюна"}'.encode('cp1251'), {'encoding': 'cp1251'}
+        )
+        for body in (b'', b'{"name":', b'NaN', b'{"a": Infinity}'):
+            with pytest.raises(ParseError) as expected:
+                JSONParser().parse(io.BytesIO(body))
+            with pytest.raises(ParseError) as error:
+                FastJSONParser().parse(io.BytesIO(body))
+            assert str(error.value) == str(expected.value), (
+                'Проверьте, что ошибки разбора совпадают с ошибками DRF.'
+            )
+
+        monkeypatch.setattr(parsers, 'orjson', None)
+        self.check_parse(b'{"name": "Dune"}')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_json_requests(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data={'name': 'Книги\u2028журналы', 'slug': 'books'},
+            format='json',
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что JSON-запросы разбираются FastJSONParser.'
+        )
+        assert b'\\u2028' in response.content, (
+            'Проверьте, что разделители строк экранируются, как в DRF.'
+        )
@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SparseFields:
+
+    def get(self, client, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        return response, sql
+
+    @pytest.mark.parametrize('fast', (True, False))
+    def test_01_fields(self, admin_client, user_client, client, settings,
+                       fast):
+        settings.FAST_LIST_SERIALIZATION = fast
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 8)
+
+        response, sql = self.get(
+            client, '/api/v1/titles/?fields=id,name,rating&year=1984'
+        )
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'id': titles[0]['id'], 'rating': 8, 'name': 'Терминатор'}
+        ], (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert 'reviews_category' not in sql and 'reviews_genre' not in sql, (
+            'Проверьте, что без полей `category` и `genre` запрос не '
+            'обращается к категориям и жанрам.'
+        )
+        assert '"description"' not in sql, (
+            'Проверьте, что запрос выбирает только нужные столбцы.'
+        )
+
+        response, sql = self.get(
+            client, '/api/v1/titles/?omit=description,genre&year=1988'
+        )
+        assert list(response.json()['results'][0]) == [
+            'id', 'category', 'rating', 'name', 'year'
+        ], 'Проверьте, что `?omit=` исключает перечисленные поля.'
+        assert response.json()['results'][0]['category'] == {
+            'name': 'Книги', 'slug': 'books'
+        }
+        assert 'reviews_genre' not in sql
+
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?fields=id,genre'
+        )
+        assert response.json() == {'id': titles[0]['id'], 'genre': [
+            {'name': 'Ужасы', 'slug': 'horror'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ]}, 'Проверьте, что `?fields=` работает и для одного произведения.'
+
+    def test_02_invalid_fields(self, client):
+        response = client.get('/api/v1/titles/?fields=id,password')
+        assert response.status_code == 400, (
+            'Если `?fields=` содержит неизвестное поле, должен вернуться '
+            'ответ со статусом 400.'
+        )
+        assert 'fields' in response.json()
+
+    def test_03_full_response_unchanged(self, admin_client, client):
+        create_titles(admin_client)
+        full = client.get('/api/v1/titles/').content
+        cache.clear()
+        assert client.get(
+            '/api/v1/titles/?fields=id,category,genre,rating,name,year,'
+            'description'
+        ).content == full, (
+            'Проверьте, что запрос всех полей возвращает полный ответ.'
+        )
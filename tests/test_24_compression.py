@@ -0,0 +1,102 @@
+import gzip
+import os
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+
+from api_yamdb.compression import CompressionMiddleware, negotiate
+from tests.utils import create_titles
+
+
+class Test24Negotiation:
+
+    def test_01_accept_encoding(self):
+        assert negotiate('gzip, deflate') == ['gzip']
+        assert negotiate('gzip;q=0') == []
+        assert negotiate('') == []
+        assert negotiate('deflate') == []
+        assert 'gzip' in negotiate('*'), (
+            'Проверьте, что `*` в Accept-Encoding разрешает gzip.'
+        )
+        assert 'gzip' not in negotiate('*, gzip;q=0')
+
+    def test_02_streaming_response(self, settings):
+        chunks = [b'line %d\n' % number for number in range(1000)]
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(
+                iter(chunks), content_type='text/plain'
+            )
+        )
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = middleware(request)
+        assert response.streaming, (
+            'Проверьте, что потоковый ответ остаётся потоковым.'
+        )
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(
+            b''.join(response.streaming_content)
+        ) == b''.join(chunks)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Compression:
+
+    def test_01_api_responses(self, admin_client, client, settings):
+        create_titles(admin_client)
+        settings.COMPRESSION_MIN_SIZE = 200
+        plain = client.get('/api/v1/titles/')
+        assert 'Content-Encoding' not in plain, (
+            'Без Accept-Encoding ответ не должен сжиматься.'
+        )
+        assert 'Accept-Encoding' in plain['Vary']
+
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что ответы API больше порога сжимаются gzip.'
+        )
+        assert gzip.decompress(response.content) == plain.content
+        assert int(response['Content-Length']) == len(response.content)
+
+        settings.COMPRESSION_MIN_SIZE = len(plain.content) + 1
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что ответы меньше COMPRESSION_MIN_SIZE не сжимаются.'
+        )
+
+    def test_02_precompressed_assets(self, client, settings, tmp_path):
+        settings.PRECOMPRESSED_ROOT = str(tmp_path)
+        response = client.get('/static/redoc.yaml', HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Без заранее сжатых файлов middleware не должна их отдавать.'
+        )
+
+        call_command('precompress_assets')
+        assert os.path.exists(tmp_path / 'redoc.yaml.gz')
+
+        response = client.get('/static/redoc.yaml', HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что `/static/redoc.yaml` отдаётся заранее сжатым.'
+        )
+        path = os.path.join(django_settings.BASE_DIR, 'static', 'redoc.yaml')
+        with open(path, 'rb') as file:
+            assert gzip.decompress(response.content) == file.read()
+
+        # Сжатый файл старше исходника: его содержимое устарело.
+        os.utime(tmp_path / 'redoc.yaml.gz', (0, 0))
+        response = client.get('/static/redoc.yaml', HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что устаревший сжатый файл не отдаётся.'
+        )
+        call_command('precompress_assets')
+
+        plain = client.get('/redoc/')
+        response = client.get('/redoc/', HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'gzip'
+        assert response['Content-Type'].startswith('text/html')
+        assert gzip.decompress(response.content) == plain.content, (
+            'Проверьте, что сжатая `/redoc/` совпадает с исходной страницей.'
+        )
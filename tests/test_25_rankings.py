@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Category, Genre, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Rankings:
+
+    @pytest.fixture
+    def titles(self):
+        films = Category.objects.create(name='Фильмы', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        users = [
+            User.objects.create(username=f'user{i}', email=f'{i}@yamdb.fake')
+            for i in range(20)
+        ]
+        # Одна десятка против двадцати девяток; провал тянет среднюю вниз.
+        lucky = Title.objects.create(name='Везунчик', year=2000,
+                                     category=films)
+        solid = Title.objects.create(name='Крепкий', year=2000,
+                                     category=films)
+        book = Title.objects.create(name='Книга', year=2000, category=books)
+        flop = Title.objects.create(name='Провал', year=2000, category=books)
+        Title.objects.create(name='Без отзывов', year=2000, category=films)
+        solid.genre.add(drama)
+        book.genre.add(drama)
+        Review.objects.create(title=lucky, author=users[0], text='т', score=10)
+        for user in users:
+            Review.objects.create(title=solid, author=user, text='т', score=9)
+            Review.objects.create(title=flop, author=user, text='т', score=5)
+        for user in users[:5]:
+            Review.objects.create(title=book, author=user, text='т', score=9)
+        return lucky, solid, book, flop
+
+    def ids(self, response):
+        assert response.status_code == 200
+        return [title['id'] for title in response.json()]
+
+    def test_01_top(self, client, titles):
+        lucky, solid, book, flop = titles
+        call_command('rebuild_rankings')
+
+        response = client.get('/api/v1/titles/top/')
+        assert self.ids(response) == [solid.id, book.id, lucky.id, flop.id], (
+            'Проверьте, что `/api/v1/titles/top/` упорядочен по байесовской '
+            'оценке и не ставит произведение с одним отзывом на первое место.'
+        )
+        assert response.json()[0]['rating'] == 9
+        assert self.ids(client.get('/api/v1/titles/top/?limit=1')) == [
+            solid.id
+        ]
+        assert self.ids(
+            client.get('/api/v1/titles/top/?category=films')
+        ) == [solid.id, lucky.id], (
+            'Проверьте, что `?category=` ограничивает рейтинг категорией.'
+        )
+        assert self.ids(
+            client.get('/api/v1/titles/top/?genre=drama&fields=id')
+        ) == [solid.id, book.id]
+        assert client.get(
+            '/api/v1/titles/top/?genre=unknown'
+        ).status_code == 404
+
+    def test_02_trending(self, client, titles):
+        lucky, solid, book, flop = titles
+        Review.objects.filter(title=solid).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        call_command('rebuild_rankings')
+        assert self.ids(client.get('/api/v1/titles/trending/')) == [
+            book.id, lucky.id, flop.id
+        ], (
+            'Проверьте, что `/api/v1/titles/trending/` учитывает только '
+            'отзывы за последнюю неделю.'
+        )
+
+    def test_03_rebuild_replaces_rankings(self, client, titles):
+        lucky, solid, book, flop = titles
+        call_command('rebuild_rankings')
+        solid.delete()
+        call_command('rebuild_rankings')
+        assert self.ids(client.get('/api/v1/titles/top/')) == [
+            book.id, lucky.id, flop.id
+        ]
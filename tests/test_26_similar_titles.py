@@ -0,0 +1,151 @@
+import math
+import random
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, SimilarTitle, Title, User
+
+pytest.importorskip('numpy')
+
+
+def cosine(left, right):
+    dot = sum(value * right.get(key, 0) for key, value in left.items())
+    norms = math.sqrt(sum(v * v for v in left.values())) * math.sqrt(
+        sum(v * v for v in right.values())
+    )
+    return dot / norms if norms else 0.0
+
+
+def reference_similarity():
+    """Сходство, посчитанное напрямую по определению."""
+    reviews = list(Review.objects.values_list('author_id', 'title_id',
+                                              'score'))
+    by_author = {}
+    for author, _, score in reviews:
+        by_author.setdefault(author, []).append(score)
+    means = {author: sum(s) / len(s) for author, s in by_author.items()}
+    features = {'review': {}, 'genre': {}, 'category': {}}
+    for author, title, score in reviews:
+        features['review'].setdefault(title, {})[author] = (
+            score - means[author]
+        )
+    for title, genre in Title.genre.through.objects.values_list(
+        'title_id', 'genre_id'
+    ):
+        features['genre'].setdefault(title, {})[genre] = 1
+    for title, category in Title.objects.values_list('id', 'category_id'):
+        if category is not None:
+            features['category'][title] = {category: 1}
+    ids = list(Title.objects.values_list('id', flat=True))
+    return {
+        (left, right): sum(
+            weight * cosine(
+                features[name].get(left, {}), features[name].get(right, {})
+            )
+            for name, weight in settings.SIMILARITY_WEIGHTS.items()
+        )
+        for left in ids for right in ids if left != right
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SimilarTitles:
+
+    @pytest.fixture
+    def dataset(self):
+        rng = random.Random(7)
+        categories = [
+            Category.objects.create(name=f'К{i}', slug=f'c{i}')
+            for i in range(3)
+        ]
+        genres = [
+            Genre.objects.create(name=f'Ж{i}', slug=f'g{i}') for i in range(5)
+        ]
+        users = [
+            User.objects.create(username=f'u{i}', email=f'{i}@yamdb.fake')
+            for i in range(15)
+        ]
+        titles = []
+        for i in range(12):
+            title = Title.objects.create(
+                name=f'Т{i}', year=2000,
+                category=rng.choice(categories + [None]),
+            )
+            title.genre.set(rng.sample(genres, rng.randint(0, 2)))
+            titles.append(title)
+        for user in users:
+            for title in rng.sample(titles, rng.randint(1, 6)):
+                Review.objects.create(
+                    title=title, author=user, text='т',
+                    score=rng.randint(1, 10)
+                )
+        return titles
+
+    def stored(self):
+        return {
+            (row.title_id, row.similar_id): (row.position, row.score)
+            for row in SimilarTitle.objects.all()
+        }
+
+    @pytest.mark.parametrize('block_size', (1, 5, None))
+    def test_01_matches_reference(self, dataset, block_size):
+        call_command(
+            'compute_similar_titles', neighbors=3, block_size=block_size
+        )
+        reference = reference_similarity()
+        stored = self.stored()
+        for title in dataset:
+            expected = sorted(
+                (
+                    (-score, other)
+                    for (left, other), score in reference.items()
+                    if left == title.id and score > 1e-9
+                )
+            )[:3]
+            rows = sorted(
+                (position, other, score)
+                for (left, other), (position, score) in stored.items()
+                if left == title.id
+            )
+            assert [other for _, other, _ in rows] == [
+                other for _, other in expected
+            ], (
+                'Проверьте, что compute_similar_titles выбирает самые '
+                'похожие произведения.'
+            )
+            for (_, other, score), (neg_score, _) in zip(rows, expected):
+                assert score == pytest.approx(-neg_score)
+
+    def test_02_similar_endpoint(self, client, dataset,
+                                 django_assert_num_queries):
+        call_command('compute_similar_titles', neighbors=3)
+        title = dataset[0]
+        expected = list(SimilarTitle.objects.filter(
+            title=title
+        ).order_by('position').values_list('similar_id', flat=True))
+        assert expected, 'Набор данных должен давать похожие произведения.'
+
+        # Соседи и их жанры.
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/similar/')
+        assert [item['id'] for item in response.json()] == expected, (
+            'Проверьте, что `/api/v1/titles/{id}/similar/` отдаёт соседей '
+            'из рассчитанной таблицы по порядку.'
+        )
+        response = client.get(
+            f'/api/v1/titles/{title.id}/similar/?limit=1&fields=id,name'
+        )
+        assert response.json() == [
+            {'id': expected[0], 'name': Title.objects.get(
+                pk=expected[0]
+            ).name}
+        ]
+
+        SimilarTitle.objects.all().delete()
+        response = client.get(f'/api/v1/titles/{title.id}/similar/')
+        assert response.status_code == 200 and response.json() == []
+        assert client.get('/api/v1/titles/999999/similar/').status_code == (
+            404
+        )
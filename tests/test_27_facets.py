@@ -0,0 +1,69 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Facets:
+
+    @pytest.fixture
+    def titles(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1984, 'category': 'films',
+            'genre': ['horror', 'drama'],
+        })
+        return titles
+
+    def test_01_facet_counts(self, client, titles,
+                             django_assert_num_queries):
+        # Количество, страница, жанры страницы и все фасеты.
+        with django_assert_num_queries(4):
+            response = client.get(
+                '/api/v1/titles/?year=1984&facets=genre,category,year'
+            )
+        data = response.json()
+        assert data['count'] == 2
+        assert data['facets'] == {
+            'genre': [
+                {'value': 'horror', 'count': 2},
+                {'value': 'comedy', 'count': 1},
+                {'value': 'drama', 'count': 1},
+            ],
+            'category': [{'value': 'films', 'count': 2}],
+            'year': [{'value': 1984, 'count': 2}],
+        }, (
+            'Проверьте, что `?facets=` добавляет счётчики по отфильтрованным '
+            'произведениям.'
+        )
+
+        response = client.get('/api/v1/titles/?facets=year')
+        assert response.json()['facets'] == {'year': [
+            {'value': 1984, 'count': 2}, {'value': 1988, 'count': 1},
+        ]}
+        assert 'facets' not in client.get('/api/v1/titles/').json(), (
+            'Без `?facets=` ответ не должен меняться.'
+        )
+
+    def test_02_cached_with_result(self, admin_client, client, titles,
+                                   django_assert_num_queries):
+        url = '/api/v1/titles/?facets=category'
+        client.get(url)
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.json()['facets']['category'] == [
+            {'value': 'films', 'count': 2}, {'value': 'books', 'count': 1},
+        ], 'Проверьте, что фасеты кэшируются вместе со списком.'
+
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Дюна', 'year': 1965, 'category': 'books',
+            'genre': ['drama'],
+        })
+        assert client.get(url).json()['facets']['category'] == [
+            {'value': 'books', 'count': 2}, {'value': 'films', 'count': 2},
+        ]
+
+    def test_03_unknown_facet(self, client):
+        response = client.get('/api/v1/titles/?facets=genre,author')
+        assert response.status_code == 400
+        assert 'facets' in response.json()
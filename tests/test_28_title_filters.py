@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+
+from api.views import TitleViewSet
+from reviews.models import TitleGenre
+from tests.utils import create_titles, explain, list_queryset
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleFilters:
+
+    @pytest.fixture
+    def titles(self, admin_client):
+        # Терминатор: фильмы, ужасы и комедия; Крепкий орешек: книги, драма.
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'category': 'books',
+            'genre': ['horror', 'drama'],
+        })
+        titles.append(response.json())
+        return [title['id'] for title in titles]
+
+    def ids(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200, query
+        data = response.json()
+        ids = sorted(title['id'] for title in data['results'])
+        assert data['count'] == len(ids), (
+            'Проверьте, что фильтр по нескольким жанрам не размножает '
+            'произведения.'
+        )
+        return ids
+
+    def test_01_exact_slugs(self, client, titles):
+        terminator, die_hard, alien = titles
+        assert self.ids(client, 'genre=horror') == [terminator, alien]
+        assert self.ids(client, 'genre=horr') == [], (
+            'Проверьте, что `genre` сравнивает slug точно.'
+        )
+        assert self.ids(client, 'category=books') == [die_hard, alien]
+        assert self.ids(client, 'category=book') == []
+        assert self.ids(client, 'genre=unknown') == []
+
+    def test_02_multiple_slugs(self, client, titles):
+        terminator, die_hard, alien = titles
+        assert self.ids(client, 'genre=horror,drama') == [
+            terminator, die_hard, alien
+        ], (
+            'Проверьте, что несколько жанров через запятую объединяются '
+            'по ИЛИ.'
+        )
+        assert self.ids(
+            client, 'genre=horror,drama&genre_match=any'
+        ) == [terminator, die_hard, alien]
+        assert self.ids(client, 'genre=horror,drama&genre_match=all') == [
+            alien
+        ], 'Проверьте, что `genre_match=all` требует все жанры.'
+        assert self.ids(client, 'genre=horror,comedy&genre_match=all') == [
+            terminator
+        ]
+        assert self.ids(client, 'category=films,books&genre=drama') == [
+            die_hard, alien
+        ]
+        response = client.get('/api/v1/titles/?genre=drama&genre_match=x')
+        assert response.status_code == 400
+
+    def test_03_icontains_opt_in(self, client, titles):
+        terminator, die_hard, alien = titles
+        assert self.ids(client, 'genre__icontains=OR') == [
+            terminator, alien
+        ], 'Проверьте, что поиск по подстроке жанра доступен явно.'
+        assert self.ids(client, 'genre__icontains=o') == [
+            terminator, alien
+        ]
+        assert self.ids(client, 'category__icontains=OOK') == [
+            die_hard, alien
+        ]
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Планы запросов проверяются для SQLite.'
+    )
+    @pytest.mark.parametrize('query', (
+        'genre=horror', 'genre=horror,drama', 'genre=horror,drama&'
+        'genre_match=all',
+    ))
+    def test_04_genre_plan(self, query):
+        plan = explain(list_queryset(TitleViewSet, f'/api/v1/titles/?{query}'))
+        assert 'INDEX title_genre_genre_title_idx' in plan, (
+            'Проверьте, что фильтр по жанру использует индекс '
+            f'(genre_id, title_id). План запроса:\n{plan}'
+        )
+        assert 'SCAN reviews_title' not in plan, (
+            'Проверьте, что фильтр по жанру не просматривает все '
+            f'произведения. План запроса:\n{plan}'
+        )
+
+    def test_05_through_pk_matches_table(self):
+        with connection.cursor() as cursor:
+            description = {
+                column.name: column for column in
+                connection.introspection.get_table_description(
+                    cursor, TitleGenre._meta.db_table
+                )
+            }['id']
+        table_type = connection.introspection.get_field_type(
+            description.type_code, description
+        )
+        assert table_type == TitleGenre._meta.pk.get_internal_type(), (
+            'Проверьте, что первичный ключ TitleGenre в модели совпадает '
+            'со столбцом таблицы, созданной в 0001.'
+        )
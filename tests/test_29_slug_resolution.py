@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre
+from tests.utils import create_categories, create_genre
+
+
+def lookups(queries):
+    """Запросы жанров и категорий по slug."""
+    return [
+        query['sql'] for query in queries
+        if '"reviews_genre"."slug" IN' in query['sql']
+        or '"reviews_genre"."slug" =' in query['sql']
+        or '"reviews_category"."slug" IN' in query['sql']
+        or '"reviews_category"."slug" =' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SlugResolution:
+
+    @pytest.fixture
+    def catalog(self, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+
+    def post(self, client, **data):
+        data = {'name': 'Терминатор', 'year': 1984, **data}
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                '/api/v1/titles/', data=data, format='json'
+            )
+        return response, lookups(context.captured_queries)
+
+    def test_01_one_query_per_model(self, admin_client, catalog):
+        response, queries = self.post(
+            admin_client, category='films',
+            genre=['horror', 'comedy', 'drama']
+        )
+        assert response.status_code == 201, response.json()
+        assert response.json()['genre'] == ['horror', 'comedy', 'drama']
+        assert len(queries) == 2, (
+            'Проверьте, что slug жанров разрешаются одним запросом IN.'
+        )
+
+        response, queries = self.post(
+            admin_client, category='films', genre=['comedy', 'horror']
+        )
+        assert response.status_code == 201
+        assert queries == [], (
+            'Проверьте, что известные slug берутся из карты в памяти.'
+        )
+
+    def test_02_invalidated_on_change(self, admin_client, catalog):
+        self.post(admin_client, category='films', genre=['drama'])
+        genre = Genre.objects.get(slug='drama')
+        genre.slug = 'tragedy'
+        genre.save()
+
+        response, _ = self.post(
+            admin_client, category='films', genre=['drama']
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что карта slug сбрасывается при изменении жанра.'
+        )
+        response, _ = self.post(
+            admin_client, category='films', genre=['tragedy']
+        )
+        assert response.status_code == 201
+        assert response.json()['genre'] == ['tragedy']
+
+        admin_client.delete('/api/v1/genres/tragedy/')
+        response, _ = self.post(
+            admin_client, category='films', genre=['tragedy']
+        )
+        assert response.status_code == 400
+
+    def test_03_errors(self, admin_client, catalog):
+        response, _ = self.post(
+            admin_client, category='films', genre=['horror', 'unknown']
+        )
+        assert response.status_code == 400
+        assert 'unknown' in response.json()['genre'][0]
+        response, _ = self.post(admin_client, category='music', genre=[])
+        assert response.status_code == 400
+        assert 'category' in response.json()
+        response, _ = self.post(admin_client, category='films', genre=[1])
+        assert response.status_code == 400
+        response, _ = self.post(admin_client, category='films', genre='drama')
+        assert response.status_code == 400
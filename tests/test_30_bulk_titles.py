@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from api import cache
+from reviews.models import Title
+from tests.utils import create_categories, create_genre, create_titles
+
+URL = '/api/v1/titles/bulk/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30BulkTitles:
+
+    @pytest.fixture
+    def catalog(self, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+
+    def genres(self, title_id):
+        return list(Title.genre.through.objects.filter(
+            title_id=title_id
+        ).order_by('genre__slug').values_list('genre__slug', flat=True))
+
+    def test_01_create_json(self, admin_client, catalog,
+                            django_assert_max_num_queries):
+        items = [
+            {'name': f'Фильм {i}', 'year': 2000 + i, 'category': 'films',
+             'genre': ['horror', 'drama', 'horror']}
+            for i in range(20)
+        ]
+        with django_assert_max_num_queries(30):
+            response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == 200, response.json()
+        results = response.json()
+        assert [result['status'] for result in results] == ['created'] * 20
+        ids = [result['id'] for result in results]
+        assert list(Title.objects.order_by('id').values_list(
+            'id', 'name'
+        )) == [(ids[i], f'Фильм {i}') for i in range(20)], (
+            'Проверьте, что bulk создаёт произведения в порядке элементов.'
+        )
+        assert self.genres(ids[0]) == ['drama', 'horror']
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 20
+
+    def test_02_ndjson_and_update(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles
+        # Список закэшируется и должен сброситься после записи пакета.
+        admin_client.get('/api/v1/titles/')
+        body = '\n'.join(json.dumps(item) for item in [
+            {'id': terminator['id'], 'year': 1991, 'genre': ['drama']},
+            {'id': die_hard['id'], 'name': 'Крепкий орешек 2'},
+            {'name': 'Чужой', 'year': 1979, 'category': 'films',
+             'genre': ['horror']},
+        ]) + '\n\n'
+        response = admin_client.generic(
+            'POST', URL, body, content_type='application/x-ndjson'
+        )
+        assert response.status_code == 200, response.json()
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            'updated', 'updated', 'created'
+        ]
+        terminator_row = Title.objects.get(pk=terminator['id'])
+        assert (terminator_row.name, terminator_row.year) == (
+            terminator['name'], 1991
+        ), 'Проверьте, что элемент с id изменяет только переданные поля.'
+        assert self.genres(terminator['id']) == ['drama']
+        assert self.genres(die_hard['id']) == ['drama']
+        assert Title.objects.get(pk=die_hard['id']).name == (
+            'Крепкий орешек 2'
+        )
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 3
+
+    def test_03_all_or_nothing(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        items = [
+            {'name': 'Чужой', 'year': 1979, 'category': 'films',
+             'genre': ['horror']},
+            {'name': 'Дюна', 'year': 1965, 'category': 'films',
+             'genre': ['unknown']},
+            {'id': 999999, 'name': 'Нет'},
+            {'id': titles[0]['id'], 'year': 'год'},
+            'строка',
+        ]
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == 400
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            'valid', 'invalid', 'invalid', 'invalid', 'invalid'
+        ]
+        assert 'genre' in results[1]['errors']
+        assert 'id' in results[2]['errors']
+        assert 'year' in results[3]['errors']
+        assert Title.objects.count() == 2, (
+            'Проверьте, что при ошибке в пакете ничего не записывается.'
+        )
+
+        response = admin_client.post(URL, data={'name': 'x'}, format='json')
+        assert response.status_code == 400
+        response = admin_client.generic(
+            'POST', URL, '{"name": "x"}\n{oops',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == 400
+
+    def test_04_admin_only(self, client, user_client, moderator_client,
+                           catalog):
+        items = [{'name': 'Чужой', 'year': 1979, 'category': 'films',
+                  'genre': ['horror']}]
+        response = client.post(
+            URL, data=json.dumps(items), content_type='application/json'
+        )
+        assert response.status_code == 401
+        for other in (user_client, moderator_client):
+            response = other.post(URL, data=items, format='json')
+            assert response.status_code == 403, (
+                'Проверьте, что bulk доступен только администратору.'
+            )
+        assert Title.objects.count() == 0
+
+    def test_05_single_bump(self, admin_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        bumps = []
+        monkeypatch.setattr(cache, 'bump_generation', bumps.append)
+        items = [
+            {'name': f'Фильм {i}', 'year': 2000, 'category': 'films',
+             'genre': ['horror']}
+            for i in range(1200)
+        ]
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == 200, response.json()
+        assert bumps == ['title'], (
+            'Проверьте, что пакет сдвигает поколение каталога один раз, '
+            'после фиксации транзакции, а не сигналом на каждую строку.'
+        )
+        ids = [result['id'] for result in response.json()]
+        assert list(Title.objects.filter(pk__in=ids).order_by(
+            'id'
+        ).values_list('id', 'name')) == [
+            (ids[i], f'Фильм {i}') for i in range(1200)
+        ], 'Проверьте, что id новых произведений совпадают с элементами.'
+        assert self.genres(ids[-1]) == ['horror']
+
+        bumps.clear()
+        response = admin_client.post(
+            URL, data=[{'id': titles[0]['id'], 'genre': ['horror']}],
+            format='json'
+        )
+        assert response.status_code == 200, response.json()
+        assert set(bumps) == {'title'}
+        assert self.genres(titles[0]['id']) == ['horror']
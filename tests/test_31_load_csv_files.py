@@ -0,0 +1,101 @@
+import csv
+import os
+import shutil
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.management.commands.load_csv_files import FILE_NAMES_CLASSES
+from reviews.models import Review, Title
+from reviews.search import FTS_TABLE, get_terms
+
+
+def read_csv(file_name):
+    path = os.path.join(settings.CSV_FILES_DIR, file_name)
+    with open(path, encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31LoadCsvFiles:
+
+    @pytest.fixture
+    def loaded(self):
+        call_command('load_csv_files')
+
+    def test_01_row_counts(self, loaded):
+        for file_name, model in FILE_NAMES_CLASSES.items():
+            assert model.objects.count() == len(read_csv(file_name)), (
+                f'Проверьте, что load_csv_files загружает все строки '
+                f'`{file_name}` в модель {model.__name__}.'
+            )
+
+    def test_02_dates_from_file(self, loaded):
+        row = read_csv('review.csv')[0]
+        review = Review.objects.get(pk=row['id'])
+        assert review.pub_date == datetime.fromisoformat(
+            row['pub_date'].replace('Z', '+00:00')
+        ), 'Проверьте, что дата отзыва берётся из файла.'
+        assert Review._meta.get_field('pub_date').auto_now_add, (
+            'Проверьте, что загрузка не меняет auto_now_add у модели.'
+        )
+
+    def test_03_ratings(self, loaded):
+        scores = defaultdict(list)
+        for row in read_csv('review.csv'):
+            scores[int(row['title_id'])].append(int(row['score']))
+        ratings = dict(Title.objects.values_list('id', 'rating'))
+        for title_id, rating in ratings.items():
+            expected = scores.get(title_id)
+            if expected is None:
+                assert rating is None
+            else:
+                expected = sum(expected) / len(expected)
+                assert rating == pytest.approx(expected), (
+                    'Проверьте, что после загрузки рейтинг пересчитан.'
+                )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Таблица FTS5 есть только в SQLite.'
+    )
+    def test_04_search_index(self, loaded):
+        # Внешняя таблица FTS5 читает строки из reviews_title, поэтому
+        # проверяется сам индекс — через MATCH.
+        with connection.cursor() as cursor:
+            for title in Title.objects.all():
+                term = get_terms(title.name)[0]
+                cursor.execute(
+                    f'SELECT rowid FROM {FTS_TABLE} '
+                    f'WHERE {FTS_TABLE} MATCH %s',
+                    [f'"{term}"']
+                )
+                assert title.id in [row[0] for row in cursor.fetchall()], (
+                    'Проверьте, что загруженные произведения попадают '
+                    'в поисковый индекс.'
+                )
+
+    def test_05_bad_row_reported(self, tmp_path, capsys):
+        for file_name in FILE_NAMES_CLASSES:
+            shutil.copy(
+                os.path.join(settings.CSV_FILES_DIR, file_name), tmp_path
+            )
+        rows = read_csv('review.csv')
+        rows[2]['pub_date'] = 'вчера'
+        with open(tmp_path / 'review.csv', 'w', encoding='utf-8',
+                  newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+        call_command('load_csv_files', path=str(tmp_path))
+        output = capsys.readouterr().out
+        assert 'Неверные данные в строке 3' in output, (
+            'Проверьте, что при ошибке load_csv_files сообщает номер '
+            'неверной строки.'
+        )
+        assert Review.objects.count() == 0
+        assert Title.objects.count() == len(read_csv('titles.csv'))
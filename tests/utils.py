@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,19 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def explain(queryset):
+    """План SQLite для запроса queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+def list_queryset(viewset, url, **kwargs):
+    """Запрос страницы, который вьюсет выполнит на GET url."""
+    view = viewset(action_map={'get': 'list'}, kwargs=kwargs)
+    view.request = view.initialize_request(APIRequestFactory().get(url))
+    view.format_kwarg = None
+    return view.filter_queryset(view.get_queryset())[:10]